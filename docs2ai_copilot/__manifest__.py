@@ -1,6 +1,6 @@
 {
     'name': 'Docs2AI copilot',
-    'version': '1.0.0',
+    'version': '1.0.1',
     'category': 'Accounting',
     'summary': 'Upload vendor bills to Docs2AI - docs2ai copilot',
     'description': """
@@ -23,6 +23,8 @@
     'depends': ['account', 'base_setup', 'hr_expense'],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron.xml',
+        'views/docs2ai_folder_views.xml',
         'views/res_config_settings_views.xml',
         'views/account_move_views.xml',
         'views/hr_expense_views.xml',
@@ -1,86 +1,1173 @@
+import base64
+import copy
+import binascii
 import logging
 import json
-from odoo import http, _
-from odoo.http import request
+import time
+import uuid
+import csv
+import io
+import gzip
+import zlib
+import hashlib
+import functools
+from datetime import date, datetime, timezone
+
+import psycopg2
+
+from odoo import api, http, models, fields as odoo_fields, _
+from odoo.http import request, Response
 from odoo.exceptions import ValidationError, UserError
+from odoo.tools.lru import LRU
+from odoo.release import version_info
+from werkzeug.http import http_date
+
+from .serializers import SERIALIZERS, column_keys, get_plan, serialize
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 _logger = logging.getLogger(__name__)
 
+# Database errors that must reach Odoo's request dispatcher, which retries
+# the whole request in a new transaction
+CONCURRENCY_ERRORS = (
+    psycopg2.errors.SerializationFailure,
+    psycopg2.errors.DeadlockDetected,
+    psycopg2.errors.LockNotAvailable,
+)
+
+# Seconds an estimated total (with_total=estimate) is served from cache
+COUNT_CACHE_TTL = 60
+_COUNT_CACHE = LRU(512)
+
+# Reference-data responses (taxes, categories) kept per worker; entries are
+# keyed by the docs2ai.api.cache generation and expire after RESPONSE_CACHE_TTL
+RESPONSE_CACHE_TTL = 300
+_RESPONSE_CACHE = LRU(256)
+
+# Responses smaller than this (bytes) are not worth compressing
+COMPRESSION_MIN_SIZE = 1024
+
+# Rows fetched from the server-side cursor per chunk of an export
+EXPORT_CHUNK_SIZE = 2000
+# Maximum number of objects in one bulk create request
+BULK_CREATE_MAX = 500
+# Maximum number of partners in one upsert request
+PARTNER_UPSERT_MAX = 5000
+# Maximum length of an Idempotency-Key header
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+# Largest page served by the list and lookup routes
+MAX_PAGE_LIMIT = 1000
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+# Filters (parameter: (field, operator, kind)) and index-backed orders of list routes
+MOVE_FILTERS = {
+    'partner_id': ('partner_id', 'in', 'ids'),
+    'journal_id': ('journal_id', 'in', 'ids'),
+    'currency_id': ('currency_id', 'in', 'ids'),
+    'state': ('state', 'in', 'list'),
+    'payment_state': ('payment_state', 'in', 'list'),
+    'date_from': ('invoice_date', '>=', 'date'),
+    'date_to': ('invoice_date', '<=', 'date'),
+}
+MOVE_ORDERS = ('id', 'invoice_date', 'date')
+EXPENSE_FILTERS = {
+    'employee_id': ('employee_id', 'in', 'ids'),
+    'product_id': ('product_id', 'in', 'ids'),
+    'company_id': ('company_id', 'in', 'ids'),
+    'state': ('state', 'in', 'list'),
+    'payment_mode': ('payment_mode', 'in', 'list'),
+    'date_from': ('date', '>=', 'date'),
+    'date_to': ('date', '<=', 'date'),
+}
+EXPENSE_ORDERS = ('id', 'date')
+
+# Models whose deletions are logged (docs2ai.sync.mixin) and served by /api/deletions
+TOMBSTONE_MODELS = ('res.partner', 'account.move', 'hr.expense', 'account.tax', 'product.product')
+
+
+def _json_dumps(data):
+    """Encode `data` to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _accepted_encoding():
+    """Best of gzip/deflate accepted by the client (Accept-Encoding), or None"""
+    accepted = request.httprequest.accept_encodings
+    quality, encoding = max((accepted[encoding], encoding) for encoding in ('gzip', 'deflate'))
+    return encoding if quality > 0 else None
+
+
+def _compress(body, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return zlib.compress(body, 6)
+
+
+def _decompress(body, encoding):
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    return zlib.decompress(body)
+
+
+def _request_digest():
+    """
+    sha256 of the method, URL and body of the request; multipart parts are
+    hashed from their (spooled) streams, so uploads are not copied in memory
+    """
+    httprequest = request.httprequest
+    digest = hashlib.sha256(b'\n'.join([httprequest.method.encode(), httprequest.full_path.encode()]))
+    if httprequest.mimetype != 'multipart/form-data':
+        digest.update(httprequest.get_data())
+        return digest.hexdigest()
+    for name, value in sorted(httprequest.form.items(multi=True)):
+        digest.update(f'\n{name}={value}'.encode())
+    for name, upload in sorted(httprequest.files.items(multi=True), key=lambda item: item[0]):
+        digest.update(f'\n{name}:{upload.filename}\n'.encode())
+        for chunk in iter(lambda: upload.stream.read(65536), b''):
+            digest.update(chunk)
+        upload.stream.seek(0)
+    return digest.hexdigest()
+
+
+def _idempotent(route):
+    """
+    Idempotency-Key support of a POST route. The first request with a key
+    runs, and its 2xx response is stored with a hash of the request; retries
+    with the same key get the stored response back without running the route
+    again. A key reused for a different request is refused (422).
+    """
+    @functools.wraps(route)
+    def wrapper(self, *args, **kwargs):
+        key = (request.httprequest.headers.get('Idempotency-Key') or '').strip()
+        if not key:
+            return route(self, *args, **kwargs)
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            error_response = {
+                'status': 'error',
+                'message': f'Idempotency-Key must be at most {IDEMPOTENCY_KEY_MAX_LENGTH} characters'
+            }
+            return _json_response(error_response, status=400)
+
+        request_hash = _request_digest()
+        keys = request.env['docs2ai.idempotency.key'].sudo()
+        claim_id, stored = keys._claim(key, request_hash)
+        if not claim_id:
+            if not stored or not stored[1]:
+                error_response = {
+                    'status': 'error',
+                    'message': 'A request with this Idempotency-Key is still in progress, please retry'
+                }
+                return _json_response(error_response, status=409)
+            stored_hash, status, body = stored
+            if stored_hash != request_hash:
+                error_response = {
+                    'status': 'error',
+                    'message': 'Idempotency-Key was already used for a different request'
+                }
+                return _json_response(error_response, status=422)
+            return _json_body_response(body.encode('utf-8'), status=status, headers=[('Idempotent-Replayed', 'true')])
+
+        response = route(self, *args, **kwargs)
+        body = response.get_data()
+        encoding = response.headers.get('Content-Encoding')
+        if encoding:
+            body = _decompress(body, encoding)
+        keys._record_response(claim_id, response.status_code, body.decode('utf-8'))
+        return response
+    return wrapper
+
+
+def _json_response(data, status=200, headers=None):
+    """
+    Shared JSON response of the REST API: fast encoding, and gzip/deflate
+    (negotiated through Accept-Encoding) for bodies above COMPRESSION_MIN_SIZE.
+    """
+    return _json_body_response(_json_dumps(data), status=status, headers=headers)
+
+
+def _json_body_response(body, status=200, headers=None):
+    """Response of already encoded JSON `body`, compressed like _json_response"""
+    response_headers = [('Content-Type', 'application/json')] + list(headers or [])
+    if len(body) >= COMPRESSION_MIN_SIZE:
+        encoding = _accepted_encoding()
+        if encoding:
+            body = _compress(body, encoding)
+            response_headers += [('Content-Encoding', encoding), ('Vary', 'Accept-Encoding')]
+    return request.make_response(body, headers=response_headers, status=status)
+
+
+def _parse_order(order, allowed):
+    """
+    Parse the `order` parameter ("invoice_date", "invoice_date asc",
+    "-invoice_date") into (field, direction). Only index-backed fields of
+    `allowed` may be used; the default is newest first on id.
+    """
+    if not order:
+        return 'id', 'desc'
+    value = order.strip()
+    direction = 'desc' if value.startswith('-') else 'asc'
+    value = value.lstrip('-+ ')
+    parts = value.split()
+    if len(parts) == 2 and parts[1].lower() in ('asc', 'desc'):
+        direction = parts[1].lower()
+    elif len(parts) != 1:
+        parts = []
+    if not parts or parts[0] not in allowed:
+        raise ValidationError(_('Invalid order: %s (allowed fields: %s)') % (order, ', '.join(allowed)))
+    return parts[0], direction
+
+
+def _order_by(order):
+    """ORDER BY of a parsed order, with id as tie-breaker so keyset cursors are stable"""
+    field, direction = order or ('id', 'desc')
+    if field == 'id':
+        return f'id {direction}'
+    return f'{field} {direction}, id {direction}'
+
+
+def _apply_cursor(domain, after, offset, order=None):
+    """
+    Keyset pagination: restrict `domain` to the records after the opaque
+    `after` cursor, which carries the last id and, for other orders, the
+    last sort value. A cursor replaces offset, so offset is reset.
+    """
+    if not after:
+        return domain, offset
+    field, direction = order or ('id', 'desc')
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(after.encode('ascii')))
+        last_id = int(payload['id'])
+        if payload.get('order', 'id desc') != f'{field} {direction}':
+            raise ValueError
+        value = payload.get('value') if field != 'id' else None
+    except (ValueError, TypeError, KeyError, AttributeError, binascii.Error):
+        raise ValidationError(_('Invalid cursor: %s') % after)
+
+    operator = '<' if direction == 'desc' else '>'
+    if field == 'id':
+        return domain + [('id', operator, last_id)], 0
+    # PostgreSQL sorts NULLs last ascending and first descending
+    if value is None:
+        if direction == 'desc':
+            keyset = ['|', (field, '!=', False), '&', (field, '=', False), ('id', operator, last_id)]
+        else:
+            keyset = ['&', (field, '=', False), ('id', operator, last_id)]
+    else:
+        keyset = ['|', (field, operator, value), '&', (field, '=', value), ('id', operator, last_id)]
+        if direction == 'asc':
+            keyset = ['|', (field, '=', False)] + keyset
+    return domain + keyset, 0
+
+
+def _parse_filters(params, filters, model):
+    """
+    Compile whitelisted filter parameters into a domain. `filters` maps a
+    parameter to (field, operator, kind); kinds are ids / list (comma
+    separated) and date (YYYY-MM-DD).
+    """
+    domain = []
+    for param, (field, operator, kind) in filters.items():
+        raw = params.get(param)
+        if raw in (None, ''):
+            continue
+        if field not in model._fields:
+            raise ValidationError(_('Filter %s is not supported on this database') % param)
+        try:
+            if kind == 'ids':
+                value = [int(item) for item in raw.split(',') if item.strip()]
+            elif kind == 'list':
+                value = [item.strip() for item in raw.split(',') if item.strip()]
+            else:
+                value = odoo_fields.Date.to_string(odoo_fields.Date.to_date(raw.strip()))
+        except (ValueError, TypeError):
+            raise ValidationError(_('Invalid value for %s: %s') % (param, raw))
+        domain.append((field, operator, value))
+    return domain
+
+
+def _parse_updated_since(updated_since):
+    """Parse an ISO 8601 date/datetime (UTC unless an offset is given) into a naive UTC datetime"""
+    value = updated_since.strip()
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(value.replace(' ', 'T', 1))
+    except ValueError:
+        raise ValidationError(_('Invalid updated_since: %s (expected an ISO 8601 datetime)') % updated_since)
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _updated_since_domain(model, updated_since):
+    """
+    Change-feed filter: records written at or after `updated_since`. Models
+    with _inherits parents (product.product) also match on the parent's
+    write_date, since editing those fields only touches the parent row.
+    """
+    if not updated_since:
+        return []
+    since = _parse_updated_since(updated_since)
+    terms = [('write_date', '>=', since)] + [
+        (f'{parent_field}.write_date', '>=', since)
+        for parent_field in model._inherits.values()
+    ]
+    return ['|'] * (len(terms) - 1) + terms
+
+
+def _server_time():
+    """Server clock (UTC) to pass as the next updated_since"""
+    return odoo_fields.Datetime.now().isoformat() + 'Z'
+
+
+def _ids_domain(ids):
+    """Domain of the comma separated `ids` parameter (at most 1000 ids)"""
+    if not ids:
+        return []
+    try:
+        record_ids = [int(item) for item in ids.split(',') if item.strip()]
+    except ValueError:
+        raise ValidationError(_('Invalid ids: %s') % ids)
+    if len(record_ids) > 1000:
+        raise ValidationError(_('At most 1000 ids can be requested at once'))
+    return [('id', 'in', record_ids)]
+
+
+def _parse_limit(limit, default, maximum=MAX_PAGE_LIMIT):
+    """Page size from the `limit` parameter: `default` when absent, else an integer in 1..maximum (ValidationError otherwise)"""
+    if limit in (None, ''):
+        return default
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        limit = 0
+    if not 1 <= limit <= maximum:
+        raise ValidationError(_('limit must be an integer between 1 and %s') % maximum)
+    return limit
+
+
+def _fetch_page(model, domain, limit, offset, order='id desc'):
+    """Search one page plus one extra row, returning (records, has_more) without counting"""
+    records = model.search(domain, limit=limit + 1, offset=offset, order=order)
+    return records[:limit], len(records) > limit
+
+
+def _next_cursor(records, has_more, order=None):
+    """Opaque cursor pointing after the last record of the page (None on the last page)"""
+    if not records or not has_more:
+        return None
+    field, direction = order or ('id', 'desc')
+    last = records[-1]
+    payload = {'id': last.id}
+    if field != 'id':
+        value = last[field]
+        if isinstance(value, datetime):
+            value = odoo_fields.Datetime.to_string(value)
+        elif isinstance(value, date):
+            value = odoo_fields.Date.to_string(value)
+        payload.update({'order': f'{field} {direction}', 'value': value if value is not False else None})
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('ascii')).decode('ascii')
+
+
+def _total_count(model, domain, with_total):
+    """
+    Totals are opt-in: with_total=true returns the exact search_count,
+    with_total=estimate a cheap estimate (planner statistics for the whole
+    table, otherwise an exact count cached for COUNT_CACHE_TTL seconds).
+    """
+    mode = (with_total or '').strip().lower()
+    if mode in ('1', 'true', 'yes', 'exact'):
+        return {'total': model.search_count(domain)}
+    if mode != 'estimate':
+        return {}
+
+    if not domain:
+        model.env.cr.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [model._table],
+        )
+        row = model.env.cr.fetchone()
+        # reltuples is -1 (or 0 on older PostgreSQL) until the table was analyzed
+        if row and row[0] > 0:
+            return {'total': row[0], 'total_estimated': True}
+
+    key = (model.env.cr.dbname, model._name, repr(domain))
+    cached = _COUNT_CACHE.get(key)
+    now = time.monotonic()
+    if cached and cached[1] > now:
+        return {'total': cached[0], 'total_estimated': True}
+    count = model.search_count(domain)
+    _COUNT_CACHE[key] = (count, now + COUNT_CACHE_TTL)
+    return {'total': count, 'total_estimated': True}
+
+
+def _domain_subquery(model, domain):
+    """SQL selecting the ids matching `domain`, as (query, params) on every supported Odoo version"""
+    sql = model._search(domain).subselect()
+    if isinstance(sql, tuple):
+        return sql
+    return sql.code, sql.params
+
+
+def _list_validator(model, domain):
+    """
+    (etag, last_modified) of a list query, from one aggregate: the number of
+    matching records and their latest write_date (including _inherits
+    parents, e.g. product.template behind product.product). The query string
+    is part of the ETag so every page/field selection has its own validator.
+    """
+    subquery, params = _domain_subquery(model, domain)
+    table = model._table
+    joins = []
+    write_dates = [f'max("{table}".write_date)']
+    for parent_model, parent_field in model._inherits.items():
+        parent_table = model.env[parent_model]._table
+        joins.append(f'JOIN "{parent_table}" ON "{parent_table}".id = "{table}"."{parent_field}"')
+        write_dates.append(f'max("{parent_table}".write_date)')
+    model.env.cr.execute(
+        f'SELECT count(*), GREATEST({", ".join(write_dates)}) FROM "{table}" {" ".join(joins)} '
+        f'WHERE "{table}".id IN ({subquery})',
+        params,
+    )
+    count, last_modified = model.env.cr.fetchone()
+    validator = f'{model._name}|{count}|{last_modified}|'.encode('utf-8') + request.httprequest.query_string
+    return f'W/"{hashlib.sha1(validator).hexdigest()}"', last_modified
+
+
+def _strip_weak(etag):
+    etag = etag.strip()
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def _validator_headers(etag, last_modified):
+    headers = [('ETag', etag), ('Cache-Control', 'private, no-cache')]
+    if last_modified:
+        headers.append(('Last-Modified', http_date(last_modified)))
+    return headers
+
+
+def _is_not_modified(etag):
+    """
+    Whether If-None-Match shows the client's copy is current. If-Modified-Since
+    is not trusted: deleting, archiving or filtering out records does not
+    raise max(write_date), while the ETag also covers the record count.
+    """
+    if_none_match = request.httprequest.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    # Weak comparison: W/"x" matches "x"
+    candidates = {_strip_weak(tag) for tag in if_none_match.split(',')}
+    return '*' in candidates or _strip_weak(etag) in candidates
+
+
+def _has_validators():
+    headers = request.httprequest.headers
+    return bool(headers.get('If-None-Match') or headers.get('If-Modified-Since'))
+
+
+def _conditional_get(model, domain, force=False):
+    """
+    Conditional GET for reference-data list routes. Returns
+    (not_modified, headers): a 304 response when If-None-Match /
+    If-Modified-Since show the client's copy is current (nothing else to
+    compute), otherwise None and the validator headers to send with the
+    full response.
+
+    The validator is an aggregate over the whole domain, so it is only
+    computed when the client sends a validator, or with `force` when the
+    response is kept in the response cache anyway.
+    """
+    if not (force or _has_validators()):
+        return None, []
+    etag, last_modified = _list_validator(model, domain)
+    headers = _validator_headers(etag, last_modified)
+    if _is_not_modified(etag):
+        return request.make_response(b'', headers=headers, status=304), headers
+    return None, headers
+
+
+def _cached_response(endpoint):
+    """
+    Look up the response cache of a reference-data route. Returns
+    (response, key): the cached (or 304) response on a hit, otherwise None
+    and the key to store the fresh response under with _cache_response().
+    """
+    generation = request.env['docs2ai.api.cache'].sudo()._get_generation()
+    key = (
+        request.env.cr.dbname, endpoint, tuple(request.env.companies.ids),
+        request.httprequest.query_string, generation,
+    )
+    cached = _RESPONSE_CACHE.get(key)
+    if not cached or cached[0] < time.monotonic():
+        return None, key
+    _expires, response_data, headers = cached
+    validators = dict(headers)
+    if _is_not_modified(validators['ETag']):
+        return request.make_response(b'', headers=headers, status=304), key
+    return _json_response(response_data, headers=headers), key
+
+
+def _cache_response(key, response_data, headers):
+    _RESPONSE_CACHE[key] = (time.monotonic() + RESPONSE_CACHE_TTL, response_data, headers)
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ','.join(str(item) for item in value)
+    if value is None or value is False:
+        return ''
+    return value
+
+
+def _stream_export(registry, uid, context, serializer, fields, domain, export_format):
+    """
+    Generator streaming every record matching `domain` as NDJSON or CSV.
+
+    Runs after the request cursor is closed, so it opens its own cursor and
+    reads ids through a PostgreSQL server-side cursor in EXPORT_CHUNK_SIZE
+    chunks. The record cache is dropped after each chunk, which keeps memory
+    flat whatever the table size.
+    """
+    with registry.cursor() as cr:
+        env = api.Environment(cr, uid, context)
+        model = env[SERIALIZERS[serializer][0]].sudo()
+        subquery, params = _domain_subquery(model, domain)
+        cursor_name = f'docs2ai_export_{uuid.uuid4().hex}'
+        cr.execute(
+            f'DECLARE {cursor_name} NO SCROLL CURSOR FOR '
+            f'SELECT id FROM "{model._table}" WHERE id IN ({subquery}) ORDER BY id DESC',
+            params,
+        )
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == 'csv':
+            writer.writerow(column_keys(env, serializer, fields))
+
+        while True:
+            cr.execute(f'FETCH FORWARD {EXPORT_CHUNK_SIZE} FROM {cursor_name}')
+            ids = [row[0] for row in cr.fetchall()]
+            if not ids:
+                break
+            rows = serialize(model.browse(ids), serializer, fields)
+            if export_format == 'csv':
+                for row in rows:
+                    writer.writerow([_csv_value(value) for value in row.values()])
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+            else:
+                yield b''.join(_json_dumps(row) + b'\n' for row in rows)
+            env.invalidate_all()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+        cr.execute(f'CLOSE {cursor_name}')
+
+
+def _compress_stream(chunks, encoding):
+    """Compress a stream of byte chunks incrementally"""
+    # wbits 31 writes a gzip container, 15 a zlib one (HTTP "deflate")
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31 if encoding == 'gzip' else 15)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _export_response(serializer, domain, fields, export_format, filename):
+    """Streamed response for an export route; fields and format are validated before streaming"""
+    export_format = (export_format or 'ndjson').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError(_('Unsupported export format: %s (use ndjson or csv)') % export_format)
+    env = request.env
+    get_plan(env, serializer, fields)
+    stream = _stream_export(env.registry, env.uid, dict(env.context), serializer, fields, domain, export_format)
+    headers = [
+        ('Content-Type', EXPORT_FORMATS[export_format]),
+        ('Content-Disposition', f'attachment; filename="{filename}.{export_format}"'),
+    ]
+    encoding = _accepted_encoding()
+    if encoding:
+        stream = _compress_stream(stream, encoding)
+        headers += [('Content-Encoding', encoding), ('Vary', 'Accept-Encoding')]
+    return Response(stream, headers=headers, direct_passthrough=True)
+
+
+# ============================================
+# CREATE
+# ============================================
+# prepare(env, data) -> create vals, raising ValidationError on bad input
+# complete(records, items) -> one dict of extra response keys per record
+
+
+def _read_create_body():
+    """
+    Body of a create route: JSON, or multipart/form-data with the JSON in
+    the `payload` part and the document in the `file` part. The file is
+    read as raw bytes into `attachment` (no base64 encoding or decoding).
+    """
+    httprequest = request.httprequest
+    if httprequest.mimetype != 'multipart/form-data':
+        return json.loads(httprequest.data.decode('utf-8')) if httprequest.data else {}
+    data = json.loads(httprequest.form.get('payload') or '{}')
+    upload = httprequest.files.get('file')
+    if upload:
+        if not isinstance(data, dict):
+            raise ValidationError(_('A multipart upload takes a single JSON object as payload'))
+        data['attachment'] = {
+            'name': upload.filename or 'document',
+            'mimetype': upload.mimetype or 'application/octet-stream',
+            'raw': upload.read(),
+        }
+    return data
+
+
+def _prepare_partner_vals(env, data, rank_field, require_name=True):
+    """Vals of a customer (rank_field='customer_rank'), vendor ('supplier_rank') or partner (None)"""
+    vals = {
+        'name': data.get('name'),
+    }
+    if rank_field:
+        vals[rank_field] = 1
+    
+    # Optional fields
+    for field in ('email', 'phone', 'street', 'street2', 'city', 'zip', 'vat', 'ref', 'is_company'):
+        if field in data:
+            vals[field] = data[field]
+    if 'mobile' in data and 'mobile' in env['res.partner']._fields:
+        vals['mobile'] = data['mobile']
+    
+    # Handle country (name or code)
+    if 'country_id' in data:
+        country_id = env['res.country']._docs2ai_resolve_country(data['country_id'])
+        if country_id:
+            vals['country_id'] = country_id
+    
+    # Handle state (name or code, within the country)
+    if 'state_id' in data and vals.get('country_id'):
+        state_id = env['res.country.state']._docs2ai_resolve_state(vals['country_id'], data['state_id'])
+        if state_id:
+            vals['state_id'] = state_id
+    
+    # Validate required fields
+    if not vals.get('name'):
+        if require_name:
+            raise ValidationError(_('Name is required'))
+        del vals['name']
+    return vals
+
+
+def _prepare_customer_vals(env, data):
+    return _prepare_partner_vals(env, data, 'customer_rank')
+
+
+def _prepare_vendor_vals(env, data):
+    return _prepare_partner_vals(env, data, 'supplier_rank')
+
+
+def _prepare_bill_vals(env, data):
+    return env['account.move']._docs2ai_api_prepare_bill_vals(data)
+
+
+def _prepare_expense_vals(env, data):
+    """Create vals of an expense"""
+    vals = {}
+    
+    # Required fields
+    if 'name' in data:
+        vals['name'] = data['name']
+    if 'employee_id' in data:
+        vals['employee_id'] = data['employee_id']
+    else:
+        # Try to get current user's employee
+        employee_id = env['res.users']._docs2ai_employee_id()
+        if not employee_id:
+            raise ValidationError(_('employee_id is required'))
+        vals['employee_id'] = employee_id
+    
+    # Optional fields
+    # Support both product_id and category_id (category_id is an alias for product_id)
+    if 'category_id' in data:
+        vals['product_id'] = data['category_id']
+    elif 'product_id' in data:
+        vals['product_id'] = data['product_id']
+    for field in ('date', 'quantity', 'price_unit', 'total_amount', 'total_amount_currency',
+                  'vendor_id', 'manager_id', 'account_id', 'description', 'analytic_distribution'):
+        if field in data:
+            vals[field] = data[field]
+    if data.get('payment_mode') in ('own_account', 'company_account'):
+        vals['payment_mode'] = data['payment_mode']
+    
+    # Handle currency - support both 'currency' and 'currency_id'
+    currency_value = data.get('currency') or data.get('currency_id')
+    if currency_value:
+        currency_id = env['res.currency']._docs2ai_resolve_currency(currency_value)
+        if currency_id:
+            vals['currency_id'] = currency_id
+    
+    # Handle taxes
+    if 'tax_ids' in data:
+        vals['tax_ids'] = [(6, 0, data['tax_ids'])]
+    return vals
+
+
+def _complete_bills(bills, items):
+    return bills._docs2ai_api_complete_bills(items)
+
+
+def _complete_expenses(expenses, items):
+    return [
+        {
+            'attachment_id': expense._docs2ai_attach_document(
+                data.get('attachment'), 'receipt.pdf', _('Receipt attached from API'), set_main=True),
+        }
+        for expense, data in zip(expenses, items)
+    ]
+
+
+def _create_records(model, vals_list, items, complete=None):
+    """One create() for the whole batch, then `complete`; returns (records, extras)"""
+    records = model.create(vals_list)
+    extras = complete(records, items) if complete else [{} for _record in records]
+    return records, extras
+
+
+def _bulk_create(model, items, prepare, serializer, complete=None):
+    """
+    Create one record per object of `items` and return the per-item results.
+
+    The whole batch is created with a single create() (and completed, e.g.
+    posted, in one call). If that fails, every item is retried alone in its
+    own savepoint, so one bad object only fails itself.
+    """
+    if len(items) > BULK_CREATE_MAX:
+        raise ValidationError(_('At most %s objects can be created at once') % BULK_CREATE_MAX)
+    cr = model.env.cr
+    results = [None] * len(items)
+    prepared = []
+    for index, data in enumerate(items):
+        try:
+            if not isinstance(data, dict):
+                raise ValidationError(_('Each item must be a JSON object'))
+            with cr.savepoint():
+                prepared.append((index, prepare(model.env, data), data))
+        except CONCURRENCY_ERRORS:
+            raise
+        except Exception as e:
+            results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+
+    def success(index, row, extra):
+        results[index] = {'index': index, 'status': 'success', 'data': {**row, **extra}}
+
+    if prepared:
+        try:
+            with cr.savepoint():
+                records, extras = _create_records(
+                    model, [copy.deepcopy(vals) for _index, vals, _data in prepared],
+                    [data for _index, _vals, data in prepared], complete)
+            for (index, _vals, _data), row, extra in zip(prepared, serialize(records, serializer), extras):
+                success(index, row, extra)
+        except CONCURRENCY_ERRORS:
+            raise
+        except Exception as e:
+            _logger.info(f"Bulk create of {len(prepared)} {model._name} failed ({e}), retrying item by item")
+            for index, vals, data in prepared:
+                try:
+                    with cr.savepoint():
+                        records, extras = _create_records(model, [vals], [data], complete)
+                    success(index, serialize(records, serializer)[0], extras[0])
+                except CONCURRENCY_ERRORS:
+                    raise
+                except Exception as e:
+                    results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+    return results
+
+
+def _bulk_response(results):
+    """201 when every item was created, 207 (Multi-Status) otherwise"""
+    failed = sum(1 for result in results if result['status'] == 'error')
+    if not failed:
+        status = 'success'
+    elif failed == len(results):
+        status = 'error'
+    else:
+        status = 'partial'
+    response_data = {
+        'status': status,
+        'created': len(results) - failed,
+        'failed': failed,
+        'results': results
+    }
+    return _json_response(response_data, status=201 if not failed else 207)
+
+
+PARTNER_RANK_FIELDS = {
+    'customer': 'customer_rank',
+    'vendor': 'supplier_rank',
+}
+
+
+def _upsert_partners(items):
+    """
+    Create or update one partner per object of `items` (see
+    res.partner._docs2ai_upsert). The upsert runs in its own transaction,
+    started once its natural keys are locked, so concurrent upserts of the
+    same partner wait for each other and cannot create duplicates. Returns
+    the per-item results.
+    """
+    if len(items) > PARTNER_UPSERT_MAX:
+        raise ValidationError(_('At most %s partners can be upserted at once') % PARTNER_UPSERT_MAX)
+    results = [None] * len(items)
+    entries = []
+    for index, data in enumerate(items):
+        try:
+            if not isinstance(data, dict):
+                raise ValidationError(_('Each item must be a JSON object'))
+            if data.get('type') not in (None, *PARTNER_RANK_FIELDS):
+                raise ValidationError(_('type must be one of: %s') % ', '.join(PARTNER_RANK_FIELDS))
+            rank_field = PARTNER_RANK_FIELDS.get(data.get('type'))
+            entries.append((index, _prepare_partner_vals(request.env, data, rank_field, require_name=False), rank_field))
+        except Exception as e:
+            results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+    if not entries:
+        return results
+
+    keys = [key for _index, vals, _rank_field in entries for key in request.env['res.partner']._docs2ai_upsert_keys(vals)]
+    with request.env.registry.cursor() as cr:
+        partners = request.env(cr=cr)['res.partner'].sudo()
+        try:
+            # Inside the try: locks taken before a failure are released below
+            partners._docs2ai_upsert_lock(keys)
+            outcome = partners._docs2ai_upsert(entries)
+            partner_ids = {value for status, value in outcome.values() if status != 'error'}
+            rows = {row['id']: row for row in serialize(partners.browse(partner_ids), 'partner')}
+            cr.commit()
+        except Exception:
+            cr.rollback()
+            raise
+        finally:
+            cr.execute('SELECT pg_advisory_unlock_all()')
+    for index, (status, value) in outcome.items():
+        if status == 'error':
+            results[index] = {'index': index, 'status': 'error', 'message': value}
+        else:
+            results[index] = {'index': index, 'status': status, 'data': rows[value]}
+    return results
+
+
+def _upsert_response(results):
+    """200 when every item was upserted, 207 (Multi-Status) otherwise"""
+    counts = {status: sum(1 for result in results if result['status'] == status) for status in ('created', 'updated', 'error')}
+    if not counts['error']:
+        status = 'success'
+    elif counts['error'] == len(results):
+        status = 'error'
+    else:
+        status = 'partial'
+    response_data = {
+        'status': status,
+        'created': counts['created'],
+        'updated': counts['updated'],
+        'failed': counts['error'],
+        'results': results
+    }
+    return _json_response(response_data, status=207 if counts['error'] else 200)
+
+
+# Serializer of the record created by each job type of docs2ai.api.job
+JOB_RECORD_SERIALIZERS = {
+    'bill': 'bill',
+}
+
+
+def _wants_async():
+    """Asynchronous mode, requested with ?async=true or a `Prefer: respond-async` header"""
+    httprequest = request.httprequest
+    return (
+        (httprequest.args.get('async') or '').lower() in ('1', 'true')
+        or 'respond-async' in httprequest.headers.get('Prefer', '')
+    )
+
+
+def _enqueue_response(job_type, data, check):
+    """
+    Validate the object or array `data` with `check`, queue one job per
+    object and answer 202 with the jobs to poll (GET /api/jobs/<id>).
+    """
+    items = data if isinstance(data, list) else [data]
+    if len(items) > BULK_CREATE_MAX:
+        raise ValidationError(_('At most %s objects can be created at once') % BULK_CREATE_MAX)
+    for index, item in enumerate(items):
+        try:
+            check(item)
+        except ValidationError as e:
+            if not isinstance(data, list):
+                raise
+            raise ValidationError(_('Item %s: %s') % (index, e)) from e
+    # Uploads are stored now, unlinked; the job links them to the record
+    model = request.env[SERIALIZERS[JOB_RECORD_SERIALIZERS[job_type]][0]]
+    for item in items:
+        if item.get('attachment'):
+            item['attachment'] = model._docs2ai_stage_document(item['attachment'])
+    jobs = request.env['docs2ai.api.job']._enqueue(job_type, items)
+    result = [{**row, 'status_url': f"/api/jobs/{row['id']}"} for row in serialize(jobs, 'job')]
+    response_data = {
+        'status': 'accepted',
+        'message': f'{len(result)} job(s) queued',
+        'data': result if isinstance(data, list) else result[0]
+    }
+    headers = [] if isinstance(data, list) else [('Location', result[0]['status_url'])]
+    return _json_response(response_data, status=202, headers=headers)
+
+
+# ============================================
+# RECORD LOOKUP
+# ============================================
+# entity: (serializer, base domain, natural keys {parameter: (field, type)})
+
+ENTITIES = {
+    'customers': ('customer', [('customer_rank', '>', 0)], {'vat': ('vat', str), 'ref': ('ref', str)}),
+    'vendors': ('vendor', [('supplier_rank', '>', 0)], {'vat': ('vat', str), 'ref': ('ref', str)}),
+    'sales-entries': ('move', [('move_type', 'in', ['out_invoice', 'out_refund'])],
+                      {'name': ('name', str), 'ref': ('ref', str)}),
+    'purchase-entries': ('move', [('move_type', 'in', ['in_invoice', 'in_refund'])],
+                         {'name': ('name', str), 'ref': ('ref', str)}),
+    'bills': ('bill', [('move_type', 'in', ['in_invoice', 'in_receipt'])],
+              {'name': ('name', str), 'ref': ('ref', str)}),
+    'expenses': ('expense', [], {}),
+    'taxes': ('tax', [], {
+        'amount': ('amount', float),
+        'type_tax_use': ('type_tax_use', str),
+        'amount_type': ('amount_type', str),
+    }),
+    'managers': ('manager', None, {'login': ('login', str)}),
+    'categories': ('category', [('can_be_expensed', '=', True)], {'default_code': ('default_code', str)}),
+}
+ENTITY_PATTERN = 'any(customers,vendors,sales-entries,purchase-entries,bills,expenses,taxes,managers,categories)'
+
+
+def _entity_domain(entity):
+    """(model, base domain, serializer) of an entity"""
+    serializer, domain, _keys = ENTITIES[entity]
+    model = request.env[SERIALIZERS[serializer][0]].sudo()
+    if domain is None:
+        # Managers: internal users in the approver group or any group implying it
+        domain = [
+            ('share', '=', False),
+            (model._docs2ai_groups_field(), 'in', list(model._docs2ai_approver_group_ids())),
+        ]
+    return model, domain, serializer
+
+
+def _natural_key_domain(entity, params):
+    """Domain of the natural key parameters of an entity (at least one is required)"""
+    keys = ENTITIES[entity][2]
+    domain = []
+    for param, (field, convert) in keys.items():
+        value = params.get(param)
+        if value in (None, ''):
+            continue
+        try:
+            domain.append((field, '=', convert(value.strip())))
+        except ValueError:
+            raise ValidationError(_('Invalid value for %s: %s') % (param, value))
+    if not domain:
+        raise ValidationError(_('Look up %s by one of: %s') % (entity, ', '.join(keys) or _('(no natural key)')))
+    return domain
+
+
+# ============================================
+# AGGREGATION
+# ============================================
+# Group-bys are public name: read_group spec; measures are summed fields
+
+MOVE_GROUPBYS = {
+    'partner': 'partner_id',
+    'month': 'invoice_date:month',
+    'state': 'state',
+    'payment_state': 'payment_state',
+    'currency': 'currency_id',
+    'journal': 'journal_id',
+}
+MOVE_MEASURES = (
+    'amount_total', 'amount_untaxed', 'amount_tax', 'amount_residual',
+    'amount_total_signed', 'amount_residual_signed',
+)
+EXPENSE_GROUPBYS = {
+    'employee': 'employee_id',
+    'product': 'product_id',
+    'month': 'date:month',
+    'state': 'state',
+    'payment_mode': 'payment_mode',
+    'currency': 'currency_id',
+}
+EXPENSE_MEASURES = ('total_amount', 'total_amount_currency', 'untaxed_amount', 'untaxed_amount_currency')
+
+# entity: (model, base domain, filters, group-bys, measures, default measures)
+AGGREGATE_SOURCES = {
+    'bills': ('account.move', [('move_type', 'in', ['in_invoice', 'in_receipt'])],
+              MOVE_FILTERS, MOVE_GROUPBYS, MOVE_MEASURES, ('amount_total', 'amount_residual')),
+    'sales-entries': ('account.move', [('move_type', 'in', ['out_invoice', 'out_refund'])],
+                      MOVE_FILTERS, MOVE_GROUPBYS, MOVE_MEASURES, ('amount_total', 'amount_residual')),
+    'purchase-entries': ('account.move', [('move_type', 'in', ['in_invoice', 'in_refund'])],
+                         MOVE_FILTERS, MOVE_GROUPBYS, MOVE_MEASURES, ('amount_total', 'amount_residual')),
+    'expenses': ('hr.expense', [], EXPENSE_FILTERS, EXPENSE_GROUPBYS, EXPENSE_MEASURES, ('total_amount',)),
+}
+
+
+def _parse_list_param(value, allowed, label):
+    names = [name.strip() for name in (value or '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValidationError(_('Unknown %s: %s (allowed: %s)') % (label, ', '.join(unknown), ', '.join(allowed)))
+    return list(dict.fromkeys(names))
+
+
+def _read_groups(model, domain, specs, measures, limit):
+    """
+    One GROUP BY query on every supported version. Yields (values, count,
+    sums) where many2one values are (id, name) and month values 'YYYY-MM'.
+    """
+    if version_info[0] >= 17:
+        aggregates = ['__count'] + [f'{measure}:sum' for measure in measures]
+        for row in model._read_group(domain, groupby=specs, aggregates=aggregates, limit=limit):
+            values = []
+            for spec, value in zip(specs, row):
+                if ':' in spec:
+                    value = value.strftime('%Y-%m') if value else None
+                elif isinstance(value, models.BaseModel):
+                    value = (value.id, value.display_name) if value else (None, '')
+                values.append(value)
+            yield values, row[len(specs)], list(row[len(specs) + 1:])
+        return
+
+    # Odoo 16: read_group returns dicts, with the month bounds in __range
+    fields_spec = [f'{measure}:sum' for measure in measures]
+    for row in model.read_group(domain, fields_spec, specs, limit=limit, lazy=False):
+        values = []
+        for spec in specs:
+            value = row[spec]
+            field = model._fields[spec.split(':')[0]]
+            if ':' in spec:
+                start = row.get('__range', {}).get(spec, {}).get('from')
+                value = start[:7] if start else None
+            elif field.type == 'many2one':
+                value = tuple(value) if value else (None, '')
+            values.append(value)
+        yield values, row['__count'], [row[measure] or 0.0 for measure in measures]
+
+
+def _aggregate_query(entity, groupby, measures, params):
+    """Validate the parameters of /api/<entity>/aggregate into (model, domain, names, specs, measures)"""
+    model_name, domain, filters, groupbys, allowed_measures, default_measures = AGGREGATE_SOURCES[entity]
+    model = request.env[model_name].sudo()
+    names = _parse_list_param(groupby, list(groupbys), _('groupby'))
+    allowed_measures = [measure for measure in allowed_measures if measure in model._fields]
+    measures = _parse_list_param(measures, allowed_measures, _('measures')) or [
+        measure for measure in default_measures if measure in model._fields
+    ]
+    domain = domain + _parse_filters(params, filters, model)
+    return model, domain, names, [groupbys[name] for name in names], measures
+
+
+def _aggregate_rows(model, domain, names, specs, measures, limit):
+    """One row per group (group-by keys, count and sums), as (data, has_more)"""
+    data = []
+    for values, count, sums in _read_groups(model, domain, specs, measures, limit + 1):
+        item = {}
+        for name, value in zip(names, values):
+            if isinstance(value, tuple):
+                item[f'{name}_id'], item[f'{name}_name'] = value
+            else:
+                item[name] = value
+        item['count'] = count
+        item.update(zip(measures, sums))
+        data.append(item)
+    return data[:limit], len(data) > limit
+
 
 class Docs2AIApiController(http.Controller):
     """REST API Controller for Docs2AI module"""
 
     @http.route('/api/customers', type='http', auth='bearer', methods=['GET'], csrf=False)
-    def list_customers(self, limit=100, offset=0, **kwargs):
+    def list_customers(self, limit=100, offset=0, after=None, fields=None, with_total=None, ids=None, updated_since=None, **kwargs):
         """
         Get list of customers
         
         :param limit: Maximum number of records to return (default: 100)
         :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param fields: Comma separated list of keys to return (default: all)
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param ids: Comma separated record ids to return (at most 1000)
+        :param updated_since: Only return records created or modified since this ISO 8601 datetime (UTC)
         :return: JSON response with customer list
         """
         try:
             # Convert limit and offset to integers
+            limit = _parse_limit(limit, 100)
             try:
-                limit = int(limit) if limit else 100
                 offset = int(offset) if offset else 0
             except (ValueError, TypeError):
-                limit = 100
                 offset = 0
             
             # Search for customers (partners with customer_rank > 0)
-            customers = request.env['res.partner'].sudo().search([
+            domain = [
                 ('customer_rank', '>', 0)
-            ], limit=limit, offset=offset, order='id desc')
-            
-            result = []
-            for customer in customers:
-                result.append({
-                    'id': customer.id,
-                    'name': customer.name,
-                    'email': customer.email or '',
-                    'phone': customer.phone or '',
-                    'mobile': getattr(customer, 'mobile', '') or '',
-                    'street': customer.street or '',
-                    'street2': customer.street2 or '',
-                    'city': customer.city or '',
-                    'state_id': customer.state_id.name if customer.state_id else '',
-                    'zip': customer.zip or '',
-                    'country_id': customer.country_id.name if customer.country_id else '',
-                    'vat': customer.vat or '',
-                    'is_company': customer.is_company,
-                    'customer_rank': customer.customer_rank,
-                })
+            ]
+            domain += _ids_domain(ids)
+            domain += _updated_since_domain(request.env['res.partner'].sudo(), updated_since)
+            
+            page_domain, offset = _apply_cursor(domain, after, offset)
+            customers, has_more = _fetch_page(request.env['res.partner'].sudo(), page_domain, limit, offset)
+            
+            result = serialize(customers, 'customer', fields)
             
             response_data = {
                 'status': 'success',
                 'count': len(result),
-                'total': request.env['res.partner'].sudo().search_count([('customer_rank', '>', 0)]),
+                **_total_count(request.env['res.partner'].sudo(), domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(customers, has_more),
+                'server_time': _server_time(),
                 'data': result
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error listing customers: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/customers', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
     def create_customer(self, **kwargs):
         """
         Create a new customer
         
-        Expected JSON body:
+        Expected JSON body (or a JSON array of up to 500 such objects, see _bulk_create):
         {
             "name": "Customer Name",
             "email": "customer@example.com",
@@ -99,61 +1186,12 @@ class Docs2AIApiController(http.Controller):
             # Parse JSON from request body for HTTP type
             data = json.loads(request.httprequest.data.decode('utf-8')) if request.httprequest.data else {}
             
-            # Prepare partner values
-            vals = {
-                'name': data.get('name'),
-                'customer_rank': 1,  # Set as customer
-            }
+            # An array creates one customer per object
+            if isinstance(data, list):
+                return _bulk_response(_bulk_create(
+                    request.env['res.partner'].sudo(), data, _prepare_customer_vals, 'customer'))
             
-            # Optional fields
-            if 'email' in data:
-                vals['email'] = data['email']
-            if 'phone' in data:
-                vals['phone'] = data['phone']
-            if 'mobile' in data and hasattr(request.env['res.partner'], 'mobile'):
-                vals['mobile'] = data['mobile']
-            if 'street' in data:
-                vals['street'] = data['street']
-            if 'street2' in data:
-                vals['street2'] = data['street2']
-            if 'city' in data:
-                vals['city'] = data['city']
-            if 'zip' in data:
-                vals['zip'] = data['zip']
-            if 'vat' in data:
-                vals['vat'] = data['vat']
-            if 'is_company' in data:
-                vals['is_company'] = data['is_company']
-            
-            # Handle country
-            if 'country_id' in data:
-                country = request.env['res.country'].sudo().search([
-                    '|', ('name', '=', data['country_id']),
-                    ('code', '=', data['country_id'])
-                ], limit=1)
-                if country:
-                    vals['country_id'] = country.id
-            
-            # Handle state
-            if 'state_id' in data and vals.get('country_id'):
-                state = request.env['res.country.state'].sudo().search([
-                    ('name', '=', data['state_id']),
-                    ('country_id', '=', vals['country_id'])
-                ], limit=1)
-                if state:
-                    vals['state_id'] = state.id
-            
-            # Validate required fields
-            if not vals.get('name'):
-                error_response = {
-                    'status': 'error',
-                    'message': 'Name is required'
-                }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+            vals = _prepare_customer_vals(request.env, data)
             
             # Create customer
             customer = request.env['res.partner'].sudo().create(vals)
@@ -161,134 +1199,101 @@ class Docs2AIApiController(http.Controller):
             response_data = {
                 'status': 'success',
                 'message': 'Customer created successfully',
-                'data': {
-                    'id': customer.id,
-                    'name': customer.name,
-                    'email': customer.email or '',
-                    'phone': customer.phone or '',
-                    'mobile': getattr(customer, 'mobile', '') or '',
-                    'street': customer.street or '',
-                    'street2': customer.street2 or '',
-                    'city': customer.city or '',
-                    'state_id': customer.state_id.name if customer.state_id else '',
-                    'zip': customer.zip or '',
-                    'country_id': customer.country_id.name if customer.country_id else '',
-                    'vat': customer.vat or '',
-                    'is_company': customer.is_company,
-                    'customer_rank': customer.customer_rank,
-                }
+                'data': serialize(customer, 'customer')[0]
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')],
-                status=201
-            )
+            return _json_response(response_data, status=201)
         except json.JSONDecodeError as e:
             _logger.error(f"JSON decode error creating customer: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': 'Invalid JSON in request body'
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except ValidationError as e:
             _logger.error(f"Validation error creating customer: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error creating customer: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/vendors', type='http', auth='bearer', methods=['GET'], csrf=False)
-    def list_vendors(self, limit=100, offset=0, **kwargs):
+    def list_vendors(self, limit=100, offset=0, after=None, fields=None, with_total=None, ids=None, updated_since=None, **kwargs):
         """
         Get list of vendors
         
         :param limit: Maximum number of records to return (default: 100)
         :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param fields: Comma separated list of keys to return (default: all)
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param ids: Comma separated record ids to return (at most 1000)
+        :param updated_since: Only return records created or modified since this ISO 8601 datetime (UTC)
         :return: JSON response with vendor list
         """
         try:
             # Convert limit and offset to integers
+            limit = _parse_limit(limit, 100)
             try:
-                limit = int(limit) if limit else 100
                 offset = int(offset) if offset else 0
             except (ValueError, TypeError):
-                limit = 100
                 offset = 0
             
             # Search for vendors (partners with supplier_rank > 0)
-            vendors = request.env['res.partner'].sudo().search([
+            domain = [
                 ('supplier_rank', '>', 0)
-            ], limit=limit, offset=offset, order='id desc')
-            
-            result = []
-            for vendor in vendors:
-                result.append({
-                    'id': vendor.id,
-                    'name': vendor.name,
-                    'email': vendor.email or '',
-                    'phone': vendor.phone or '',
-                    'mobile': getattr(vendor, 'mobile', '') or '',
-                    'street': vendor.street or '',
-                    'street2': vendor.street2 or '',
-                    'city': vendor.city or '',
-                    'state_id': vendor.state_id.name if vendor.state_id else '',
-                    'zip': vendor.zip or '',
-                    'country_id': vendor.country_id.name if vendor.country_id else '',
-                    'vat': vendor.vat or '',
-                    'is_company': vendor.is_company,
-                    'supplier_rank': vendor.supplier_rank,
-                })
+            ]
+            domain += _ids_domain(ids)
+            domain += _updated_since_domain(request.env['res.partner'].sudo(), updated_since)
+            not_modified, cache_headers = _conditional_get(request.env['res.partner'].sudo(), domain)
+            if not_modified:
+                return not_modified
+            
+            page_domain, offset = _apply_cursor(domain, after, offset)
+            vendors, has_more = _fetch_page(request.env['res.partner'].sudo(), page_domain, limit, offset)
+            
+            result = serialize(vendors, 'vendor', fields)
             
             response_data = {
                 'status': 'success',
                 'count': len(result),
-                'total': request.env['res.partner'].sudo().search_count([('supplier_rank', '>', 0)]),
+                **_total_count(request.env['res.partner'].sudo(), domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(vendors, has_more),
+                'server_time': _server_time(),
                 'data': result
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data, headers=cache_headers)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error listing vendors: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/vendors', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
     def create_vendor(self, **kwargs):
         """
         Create a new vendor
         
-        Expected JSON body:
+        Expected JSON body (or a JSON array of up to 500 such objects, see _bulk_create):
         {
             "name": "Vendor Name",
             "email": "vendor@example.com",
@@ -307,61 +1312,12 @@ class Docs2AIApiController(http.Controller):
             # Parse JSON from request body for HTTP type
             data = json.loads(request.httprequest.data.decode('utf-8')) if request.httprequest.data else {}
             
-            # Prepare partner values
-            vals = {
-                'name': data.get('name'),
-                'supplier_rank': 1,  # Set as vendor
-            }
+            # An array creates one vendor per object
+            if isinstance(data, list):
+                return _bulk_response(_bulk_create(
+                    request.env['res.partner'].sudo(), data, _prepare_vendor_vals, 'vendor'))
             
-            # Optional fields
-            if 'email' in data:
-                vals['email'] = data['email']
-            if 'phone' in data:
-                vals['phone'] = data['phone']
-            if 'mobile' in data and hasattr(request.env['res.partner'], 'mobile'):
-                vals['mobile'] = data['mobile']
-            if 'street' in data:
-                vals['street'] = data['street']
-            if 'street2' in data:
-                vals['street2'] = data['street2']
-            if 'city' in data:
-                vals['city'] = data['city']
-            if 'zip' in data:
-                vals['zip'] = data['zip']
-            if 'vat' in data:
-                vals['vat'] = data['vat']
-            if 'is_company' in data:
-                vals['is_company'] = data['is_company']
-            
-            # Handle country
-            if 'country_id' in data:
-                country = request.env['res.country'].sudo().search([
-                    '|', ('name', '=', data['country_id']),
-                    ('code', '=', data['country_id'])
-                ], limit=1)
-                if country:
-                    vals['country_id'] = country.id
-            
-            # Handle state
-            if 'state_id' in data and vals.get('country_id'):
-                state = request.env['res.country.state'].sudo().search([
-                    ('name', '=', data['state_id']),
-                    ('country_id', '=', vals['country_id'])
-                ], limit=1)
-                if state:
-                    vals['state_id'] = state.id
-            
-            # Validate required fields
-            if not vals.get('name'):
-                error_response = {
-                    'status': 'error',
-                    'message': 'Name is required'
-                }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+            vals = _prepare_vendor_vals(request.env, data)
             
             # Create vendor
             vendor = request.env['res.partner'].sudo().create(vals)
@@ -369,133 +1325,97 @@ class Docs2AIApiController(http.Controller):
             response_data = {
                 'status': 'success',
                 'message': 'Vendor created successfully',
-                'data': {
-                    'id': vendor.id,
-                    'name': vendor.name,
-                    'email': vendor.email or '',
-                    'phone': vendor.phone or '',
-                    'mobile': getattr(vendor, 'mobile', '') or '',
-                    'street': vendor.street or '',
-                    'street2': vendor.street2 or '',
-                    'city': vendor.city or '',
-                    'state_id': vendor.state_id.name if vendor.state_id else '',
-                    'zip': vendor.zip or '',
-                    'country_id': vendor.country_id.name if vendor.country_id else '',
-                    'vat': vendor.vat or '',
-                    'is_company': vendor.is_company,
-                    'supplier_rank': vendor.supplier_rank,
-                }
+                'data': serialize(vendor, 'vendor')[0]
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')],
-                status=201
-            )
+            return _json_response(response_data, status=201)
         except json.JSONDecodeError as e:
             _logger.error(f"JSON decode error creating vendor: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': 'Invalid JSON in request body'
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except ValidationError as e:
             _logger.error(f"Validation error creating vendor: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error creating vendor: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/sales-entries', type='http', auth='bearer', methods=['GET'], csrf=False)
-    def list_sales_entries(self, limit=100, offset=0, **kwargs):
+    def list_sales_entries(self, limit=100, offset=0, after=None, fields=None, with_total=None, ids=None, updated_since=None, order=None, **kwargs):
         """
         Get list of sales entries (customer invoices and credit notes)
         
         :param limit: Maximum number of records to return (default: 100)
         :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param fields: Comma separated list of keys to return (default: all)
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param ids: Comma separated record ids to return (at most 1000)
+        :param updated_since: Only return records created or modified since this ISO 8601 datetime (UTC)
+        :param order: Sort field (id, invoice_date or date), optionally followed by asc/desc (default: id desc)
+        :param kwargs: Filters: partner_id, journal_id, currency_id, state, payment_state (comma separated), date_from / date_to (invoice date)
         :return: JSON response with sales entries list
         """
         try:
             # Convert limit and offset to integers
+            limit = _parse_limit(limit, 100)
             try:
-                limit = int(limit) if limit else 100
                 offset = int(offset) if offset else 0
             except (ValueError, TypeError):
-                limit = 100
                 offset = 0
             
             # Search for sales entries (out_invoice and out_refund)
-            sales_entries = request.env['account.move'].sudo().search([
+            domain = [
                 ('move_type', 'in', ['out_invoice', 'out_refund'])
-            ], limit=limit, offset=offset, order='id desc')
-            
-            result = []
-            for entry in sales_entries:
-                result.append({
-                    'id': entry.id,
-                    'name': entry.name or '',
-                    'move_type': entry.move_type,
-                    'move_type_label': dict(entry._fields['move_type'].selection).get(entry.move_type, ''),
-                    'partner_id': entry.partner_id.id if entry.partner_id else None,
-                    'partner_name': entry.partner_id.name if entry.partner_id else '',
-                    'date': entry.date.isoformat() if entry.date else '',
-                    'invoice_date': entry.invoice_date.isoformat() if entry.invoice_date else '',
-                    'invoice_date_due': entry.invoice_date_due.isoformat() if entry.invoice_date_due else '',
-                    'state': entry.state,
-                    'amount_total': entry.amount_total,
-                    'amount_untaxed': entry.amount_untaxed,
-                    'amount_tax': entry.amount_tax,
-                    'amount_residual': entry.amount_residual,
-                    'currency_id': entry.currency_id.name if entry.currency_id else '',
-                    'payment_state': entry.payment_state,
-                    'journal_id': entry.journal_id.name if entry.journal_id else '',
-                    'company_id': entry.company_id.name if entry.company_id else '',
-                })
+            ]
+            domain += _parse_filters(kwargs, MOVE_FILTERS, request.env['account.move'])
+            sort = _parse_order(order, MOVE_ORDERS)
+            domain += _ids_domain(ids)
+            domain += _updated_since_domain(request.env['account.move'].sudo(), updated_since)
+            
+            page_domain, offset = _apply_cursor(domain, after, offset, sort)
+            sales_entries, has_more = _fetch_page(request.env['account.move'].sudo(), page_domain, limit, offset, _order_by(sort))
+            
+            result = serialize(sales_entries, 'move', fields)
             
             response_data = {
                 'status': 'success',
                 'count': len(result),
-                'total': request.env['account.move'].sudo().search_count([('move_type', 'in', ['out_invoice', 'out_refund'])]),
+                **_total_count(request.env['account.move'].sudo(), domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(sales_entries, has_more, sort),
+                'server_time': _server_time(),
                 'data': result
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error listing sales entries: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/sales-entries', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
     def create_sales_entry(self, **kwargs):
         """
         Create a new sales entry (customer invoice)
@@ -535,11 +1455,7 @@ class Docs2AIApiController(http.Controller):
                     'status': 'error',
                     'message': 'partner_id is required'
                 }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+                return _json_response(error_response, status=400)
             
             # Optional fields
             if 'invoice_date' in data:
@@ -549,12 +1465,9 @@ class Docs2AIApiController(http.Controller):
             if 'journal_id' in data:
                 vals['journal_id'] = data['journal_id']
             if 'currency_id' in data:
-                currency = request.env['res.currency'].sudo().search([
-                    '|', ('name', '=', data['currency_id']),
-                    ('id', '=', data['currency_id'])
-                ], limit=1)
-                if currency:
-                    vals['currency_id'] = currency.id
+                currency_id = request.env['res.currency']._docs2ai_resolve_currency(data['currency_id'])
+                if currency_id:
+                    vals['currency_id'] = currency_id
             
             # Invoice lines
             if 'invoice_line_ids' in data:
@@ -582,130 +1495,97 @@ class Docs2AIApiController(http.Controller):
             response_data = {
                 'status': 'success',
                 'message': 'Sales entry created successfully',
-                'data': {
-                    'id': invoice.id,
-                    'name': invoice.name or '',
-                    'move_type': invoice.move_type,
-                    'partner_id': invoice.partner_id.id if invoice.partner_id else None,
-                    'partner_name': invoice.partner_id.name if invoice.partner_id else '',
-                    'date': invoice.date.isoformat() if invoice.date else '',
-                    'invoice_date': invoice.invoice_date.isoformat() if invoice.invoice_date else '',
-                    'state': invoice.state,
-                    'amount_total': invoice.amount_total,
-                    'amount_untaxed': invoice.amount_untaxed,
-                    'amount_tax': invoice.amount_tax,
-                }
+                'data': serialize(invoice, 'move')[0]
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')],
-                status=201
-            )
+            return _json_response(response_data, status=201)
         except json.JSONDecodeError as e:
             _logger.error(f"JSON decode error creating sales entry: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': 'Invalid JSON in request body'
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except ValidationError as e:
             _logger.error(f"Validation error creating sales entry: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error creating sales entry: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/purchase-entries', type='http', auth='bearer', methods=['GET'], csrf=False)
-    def list_purchase_entries(self, limit=100, offset=0, **kwargs):
+    def list_purchase_entries(self, limit=100, offset=0, after=None, fields=None, with_total=None, ids=None, updated_since=None, order=None, **kwargs):
         """
         Get list of purchase entries (vendor bills and credit notes)
         
         :param limit: Maximum number of records to return (default: 100)
         :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param fields: Comma separated list of keys to return (default: all)
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param ids: Comma separated record ids to return (at most 1000)
+        :param updated_since: Only return records created or modified since this ISO 8601 datetime (UTC)
+        :param order: Sort field (id, invoice_date or date), optionally followed by asc/desc (default: id desc)
+        :param kwargs: Filters: partner_id, journal_id, currency_id, state, payment_state (comma separated), date_from / date_to (invoice date)
         :return: JSON response with purchase entries list
         """
         try:
             # Convert limit and offset to integers
+            limit = _parse_limit(limit, 100)
             try:
-                limit = int(limit) if limit else 100
                 offset = int(offset) if offset else 0
             except (ValueError, TypeError):
-                limit = 100
                 offset = 0
             
             # Search for purchase entries (in_invoice and in_refund)
-            purchase_entries = request.env['account.move'].sudo().search([
+            domain = [
                 ('move_type', 'in', ['in_invoice', 'in_refund'])
-            ], limit=limit, offset=offset, order='id desc')
-            
-            result = []
-            for entry in purchase_entries:
-                result.append({
-                    'id': entry.id,
-                    'name': entry.name or '',
-                    'move_type': entry.move_type,
-                    'move_type_label': dict(entry._fields['move_type'].selection).get(entry.move_type, ''),
-                    'partner_id': entry.partner_id.id if entry.partner_id else None,
-                    'partner_name': entry.partner_id.name if entry.partner_id else '',
-                    'date': entry.date.isoformat() if entry.date else '',
-                    'invoice_date': entry.invoice_date.isoformat() if entry.invoice_date else '',
-                    'invoice_date_due': entry.invoice_date_due.isoformat() if entry.invoice_date_due else '',
-                    'state': entry.state,
-                    'amount_total': entry.amount_total,
-                    'amount_untaxed': entry.amount_untaxed,
-                    'amount_tax': entry.amount_tax,
-                    'amount_residual': entry.amount_residual,
-                    'currency_id': entry.currency_id.name if entry.currency_id else '',
-                    'payment_state': entry.payment_state,
-                    'journal_id': entry.journal_id.name if entry.journal_id else '',
-                    'company_id': entry.company_id.name if entry.company_id else '',
-                })
+            ]
+            domain += _parse_filters(kwargs, MOVE_FILTERS, request.env['account.move'])
+            sort = _parse_order(order, MOVE_ORDERS)
+            domain += _ids_domain(ids)
+            domain += _updated_since_domain(request.env['account.move'].sudo(), updated_since)
+            
+            page_domain, offset = _apply_cursor(domain, after, offset, sort)
+            purchase_entries, has_more = _fetch_page(request.env['account.move'].sudo(), page_domain, limit, offset, _order_by(sort))
+            
+            result = serialize(purchase_entries, 'move', fields)
             
             response_data = {
                 'status': 'success',
                 'count': len(result),
-                'total': request.env['account.move'].sudo().search_count([('move_type', 'in', ['in_invoice', 'in_refund'])]),
+                **_total_count(request.env['account.move'].sudo(), domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(purchase_entries, has_more, sort),
+                'server_time': _server_time(),
                 'data': result
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error listing purchase entries: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/purchase-entries', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
     def create_purchase_entry(self, **kwargs):
         """
         Create a new purchase entry (vendor bill)
@@ -745,11 +1625,7 @@ class Docs2AIApiController(http.Controller):
                     'status': 'error',
                     'message': 'partner_id is required'
                 }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+                return _json_response(error_response, status=400)
             
             # Optional fields
             if 'invoice_date' in data:
@@ -759,12 +1635,9 @@ class Docs2AIApiController(http.Controller):
             if 'journal_id' in data:
                 vals['journal_id'] = data['journal_id']
             if 'currency_id' in data:
-                currency = request.env['res.currency'].sudo().search([
-                    '|', ('name', '=', data['currency_id']),
-                    ('id', '=', data['currency_id'])
-                ], limit=1)
-                if currency:
-                    vals['currency_id'] = currency.id
+                currency_id = request.env['res.currency']._docs2ai_resolve_currency(data['currency_id'])
+                if currency_id:
+                    vals['currency_id'] = currency_id
             
             # Invoice lines
             if 'invoice_line_ids' in data:
@@ -795,140 +1668,102 @@ class Docs2AIApiController(http.Controller):
             response_data = {
                 'status': 'success',
                 'message': 'Purchase entry created successfully',
-                'data': {
-                    'id': bill.id,
-                    'name': bill.name or '',
-                    'move_type': bill.move_type,
-                    'partner_id': bill.partner_id.id if bill.partner_id else None,
-                    'partner_name': bill.partner_id.name if bill.partner_id else '',
-                    'date': bill.date.isoformat() if bill.date else '',
-                    'invoice_date': bill.invoice_date.isoformat() if bill.invoice_date else '',
-                    'state': bill.state,
-                    'amount_total': bill.amount_total,
-                    'amount_untaxed': bill.amount_untaxed,
-                    'amount_tax': bill.amount_tax,
-                }
+                'data': serialize(bill, 'move')[0]
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')],
-                status=201
-            )
+            return _json_response(response_data, status=201)
         except json.JSONDecodeError as e:
             _logger.error(f"JSON decode error creating purchase entry: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': 'Invalid JSON in request body'
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except ValidationError as e:
             _logger.error(f"Validation error creating purchase entry: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error creating purchase entry: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/bills', type='http', auth='bearer', methods=['GET'], csrf=False)
-    def list_bills(self, limit=100, offset=0, **kwargs):
+    def list_bills(self, limit=100, offset=0, after=None, fields=None, with_total=None, ids=None, updated_since=None, order=None, **kwargs):
         """
         Get list of vendor bills only (not refunds)
         
         :param limit: Maximum number of records to return (default: 100)
         :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param fields: Comma separated list of keys to return (default: all)
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param ids: Comma separated record ids to return (at most 1000)
+        :param updated_since: Only return records created or modified since this ISO 8601 datetime (UTC)
+        :param order: Sort field (id, invoice_date or date), optionally followed by asc/desc (default: id desc)
+        :param kwargs: Filters: partner_id, journal_id, currency_id, state, payment_state (comma separated), date_from / date_to (invoice date)
         :return: JSON response with vendor bills list
         """
         try:
             # Convert limit and offset to integers
+            limit = _parse_limit(limit, 100)
             try:
-                limit = int(limit) if limit else 100
                 offset = int(offset) if offset else 0
             except (ValueError, TypeError):
-                limit = 100
                 offset = 0
             
             # Search for vendor bills and receipts (in_invoice and in_receipt, not in_refund)
-            bills = request.env['account.move'].sudo().search([
+            domain = [
                 ('move_type', 'in', ['in_invoice', 'in_receipt'])
-            ], limit=limit, offset=offset, order='id desc')
+            ]
+            domain += _parse_filters(kwargs, MOVE_FILTERS, request.env['account.move'])
+            sort = _parse_order(order, MOVE_ORDERS)
+            domain += _ids_domain(ids)
+            domain += _updated_since_domain(request.env['account.move'].sudo(), updated_since)
             
-            result = []
-            for bill in bills:
-                # Determine type based on move_type
-                bill_type = 'receipt' if bill.move_type == 'in_receipt' else 'bill'
-                type_label = 'Purchase Receipt' if bill.move_type == 'in_receipt' else 'Vendor Bill'
-                
-                result.append({
-                    'id': bill.id,
-                    'name': bill.name or '',
-                    'type': bill_type,
-                    'move_type': bill.move_type,
-                    'move_type_label': type_label,
-                    'partner_id': bill.partner_id.id if bill.partner_id else None,
-                    'partner_name': bill.partner_id.name if bill.partner_id else '',
-                    'date': bill.date.isoformat() if bill.date else '',
-                    'invoice_date': bill.invoice_date.isoformat() if bill.invoice_date else '',
-                    'invoice_date_due': bill.invoice_date_due.isoformat() if bill.invoice_date_due else '',
-                    'state': bill.state,
-                    'amount_total': bill.amount_total,
-                    'amount_untaxed': bill.amount_untaxed,
-                    'amount_tax': bill.amount_tax,
-                    'amount_residual': bill.amount_residual,
-                    'currency_id': bill.currency_id.name if bill.currency_id else '',
-                    'payment_state': bill.payment_state,
-                    'journal_id': bill.journal_id.name if bill.journal_id else '',
-                    'company_id': bill.company_id.name if bill.company_id else '',
-                })
+            page_domain, offset = _apply_cursor(domain, after, offset, sort)
+            bills, has_more = _fetch_page(request.env['account.move'].sudo(), page_domain, limit, offset, _order_by(sort))
+            
+            result = serialize(bills, 'bill', fields)
             
             response_data = {
                 'status': 'success',
                 'count': len(result),
-                'total': request.env['account.move'].sudo().search_count([('move_type', 'in', ['in_invoice', 'in_receipt'])]),
+                **_total_count(request.env['account.move'].sudo(), domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(bills, has_more, sort),
+                'server_time': _server_time(),
                 'data': result
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error listing bills: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/bills', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
     def create_bill(self, **kwargs):
         """
         Create a new vendor bill or receipt
         
-        Expected JSON body:
+        Expected JSON body (or a JSON array of up to 500 such objects, see _bulk_create):
         {
             "type": "bill",  // "bill" or "receipt" (default: "bill")
             "partner_id": 1,
@@ -954,348 +1789,140 @@ class Docs2AIApiController(http.Controller):
             ]
         }
         
+        The document can instead be uploaded as multipart/form-data: the JSON
+        object in a `payload` part and the file in a `file` part.
+        
+        With ?async=true (or `Prefer: respond-async`) the payload is only
+        validated and queued: the response is 202 with a job to poll on
+        GET /api/jobs/<id>.
+        
         :return: JSON response with created vendor bill/receipt data
         """
         try:
             # Parse JSON from request body for HTTP type
-            data = json.loads(request.httprequest.data.decode('utf-8')) if request.httprequest.data else {}
+            data = _read_create_body()
             
-            # Determine move_type based on type field
-            bill_type = data.get('type', 'bill').lower()
-            if bill_type == 'receipt':
-                move_type = 'in_receipt'  # Purchase Receipt
-            else:
-                move_type = 'in_invoice'  # Vendor Bill (default)
+            # Asynchronous mode: validate, queue and answer 202
+            if _wants_async():
+                return _enqueue_response('bill', data, request.env['account.move']._docs2ai_api_check_bill_payload)
             
-            # Prepare bill values
-            vals = {
-                'move_type': move_type,
-            }
+            # An array creates one bill per object, posted together
+            if isinstance(data, list):
+                return _bulk_response(_bulk_create(
+                    request.env['account.move'].sudo(), data, _prepare_bill_vals, 'bill', _complete_bills))
             
-            # Required fields
-            if 'partner_id' in data:
-                vals['partner_id'] = data['partner_id']
-            else:
-                error_response = {
-                    'status': 'error',
-                    'message': 'partner_id is required'
-                }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+            vals = _prepare_bill_vals(request.env, data)
             
-            # Optional fields
-            if 'invoice_date' in data:
-                vals['invoice_date'] = data['invoice_date']
-            if 'invoice_date_due' in data:
-                vals['invoice_date_due'] = data['invoice_date_due']
-            if 'journal_id' in data:
-                vals['journal_id'] = data['journal_id']
-            currency_code = data.get('currency')
-            currency_id_value = data.get('currency_id')  # Backward compatibility
-            if currency_code:
-                currency_code = currency_code.upper()
-                currency_env = request.env['res.currency'].sudo().with_context(active_test=False)
-                currency = currency_env.search([
-                    '|', ('name', '=', currency_code),
-                    ('symbol', '=', currency_code)
-                ], limit=1)
-                if currency:
-                    if not currency.active:
-                        currency.write({'active': True})
-                else:
-                    currency_vals = {
-                        'name': currency_code,
-                        'symbol': currency_code,
-                        'rounding': 0.01,
-                        'active': True,
-                    }
-                    if 'decimal_places' in currency_env._fields:
-                        currency_vals['decimal_places'] = 2
-                    currency = currency_env.create(currency_vals)
-                    _logger.info(f'Auto-created currency {currency_code} (ID: {currency.id})')
-                vals['currency_id'] = currency.id
-            elif currency_id_value:
-                currency = request.env['res.currency'].sudo().search([
-                    '|', ('name', '=', currency_id_value),
-                    ('id', '=', currency_id_value)
-                ], limit=1)
-                if currency:
-                    vals['currency_id'] = currency.id
-            
-            # Invoice lines
-            if 'invoice_line_ids' in data:
-                line_vals = []
-                for line in data['invoice_line_ids']:
-                    line_data = {}
-                    if 'product_id' in line:
-                        line_data['product_id'] = line['product_id']
-                    if 'name' in line:
-                        line_data['name'] = line['name']
-                    if 'quantity' in line:
-                        line_data['quantity'] = line['quantity']
-                    if 'price_unit' in line:
-                        line_data['price_unit'] = line['price_unit']
-                    
-                    # Handle tax - can be percentage (tax) or tax_ids array
-                    if 'tax' in line:
-                        # Search for tax by percentage rate for purchase invoices
-                        tax_percentage = float(line['tax'])
-                        tax = request.env['account.tax'].sudo().search([
-                            ('amount', '=', tax_percentage),
-                            ('type_tax_use', '=', 'purchase'),  # For vendor bills
-                            ('amount_type', '=', 'percent'),
-                        ], limit=1)
-                        if not tax:
-                            # Auto-create tax if not found
-                            company = request.env.company
-                            # Get tax account from existing purchase tax or find suitable account
-                            tax_account = None
-                            # Try to get account from default purchase tax
-                            if company.account_purchase_tax_id:
-                                existing_tax = company.account_purchase_tax_id
-                                tax_line = existing_tax.invoice_repartition_line_ids.filtered(
-                                    lambda l: l.repartition_type == 'tax'
-                                )
-                                if tax_line and tax_line[0].account_id:
-                                    tax_account = tax_line[0].account_id
-                            
-                            # If no account found, try to find any expense account
-                            if not tax_account:
-                                tax_account = request.env['account.account'].sudo().search([
-                                    ('account_type', '=', 'expense'),
-                                    ('company_id', '=', company.id)
-                                ], limit=1)
-                            
-                            # Create the tax record
-                            tax_vals = {
-                                'name': f'Tax {tax_percentage}%',
-                                'amount': tax_percentage,
-                                'amount_type': 'percent',
-                                'type_tax_use': 'purchase',
-                                'company_id': company.id,
-                                'invoice_repartition_line_ids': [
-                                    (0, 0, {
-                                        'repartition_type': 'base',
-                                        'factor_percent': 100.0,
-                                    }),
-                                    (0, 0, {
-                                        'repartition_type': 'tax',
-                                        'factor_percent': 100.0,
-                                        'account_id': tax_account.id if tax_account else False,
-                                    }),
-                                ],
-                                'refund_repartition_line_ids': [
-                                    (0, 0, {
-                                        'repartition_type': 'base',
-                                        'factor_percent': 100.0,
-                                    }),
-                                    (0, 0, {
-                                        'repartition_type': 'tax',
-                                        'factor_percent': 100.0,
-                                        'account_id': tax_account.id if tax_account else False,
-                                    }),
-                                ],
-                            }
-                            tax = request.env['account.tax'].sudo().create(tax_vals)
-                            _logger.info(f'Auto-created tax {tax_percentage}% for purchase invoices (ID: {tax.id})')
-                        line_data['tax_ids'] = [(6, 0, [tax.id])]
-                    elif 'tax_ids' in line:
-                        # Backward compatibility with tax_ids
-                        line_data['tax_ids'] = [(6, 0, line['tax_ids'])]
-                    
-                    if 'account_id' in line:
-                        line_data['account_id'] = line['account_id']
-                    line_vals.append((0, 0, line_data))
-                vals['invoice_line_ids'] = line_vals
-            
-            # Create bill
-            bill = request.env['account.move'].sudo().create(vals)
-            
-            # Handle bill_name if provided (after creation to override auto-generated name)
-            if 'bill_name' in data and data['bill_name']:
-                bill.write({'name': data['bill_name']})
-            
-            # Post the bill
-            bill.action_post()
-            
-            # Handle attachment if provided
-            attachment_id = None
-            if 'attachment' in data and data['attachment']:
-                attachment_data = data['attachment']
-                attachment_name = attachment_data.get('name', 'document.pdf')
-                attachment_datas = attachment_data.get('data', '')
-                attachment_mimetype = attachment_data.get('mimetype', 'application/pdf')
-                
-                if attachment_datas:
-                    # Create ir.attachment record
-                    attachment_vals = {
-                        'name': attachment_name,
-                        'datas': attachment_datas,
-                        'res_model': 'account.move',
-                        'res_id': bill.id,
-                        'mimetype': attachment_mimetype,
-                        'type': 'binary',
-                    }
-                    attachment = request.env['ir.attachment'].sudo().create(attachment_vals)
-                    attachment_id = attachment.id
-                    
-                    # Post attachment in the chatter
-                    bill.message_post(
-                        body=_('Document attached from API'),
-                        attachment_ids=[attachment.id]
-                    )
+            # Create and post the bill, then attach the document
+            bill, extras = _create_records(request.env['account.move'].sudo(), [vals], [data], _complete_bills)
             
             # Determine type label
-            type_label = 'Purchase Receipt' if move_type == 'in_receipt' else 'Vendor Bill'
+            type_label = 'Purchase Receipt' if bill.move_type == 'in_receipt' else 'Vendor Bill'
             
             response_data = {
                 'status': 'success',
                 'message': f'{type_label} created successfully',
                 'data': {
-                    'id': bill.id,
-                    'name': bill.name or '',
-                    'type': bill_type,
-                    'move_type': bill.move_type,
-                    'move_type_label': type_label,
-                    'partner_id': bill.partner_id.id if bill.partner_id else None,
-                    'partner_name': bill.partner_id.name if bill.partner_id else '',
-                    'date': bill.date.isoformat() if bill.date else '',
-                    'invoice_date': bill.invoice_date.isoformat() if bill.invoice_date else '',
-                    'currency': bill.currency_id.name if bill.currency_id else '',
-                    'state': bill.state,
-                    'amount_total': bill.amount_total,
-                    'amount_untaxed': bill.amount_untaxed,
-                    'amount_tax': bill.amount_tax,
-                    'attachment_id': attachment_id,
+                    **serialize(bill, 'bill')[0],
+                    **extras[0],
                 }
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')],
-                status=201
-            )
+            return _json_response(response_data, status=201)
+        except CONCURRENCY_ERRORS:
+            raise
         except json.JSONDecodeError as e:
             _logger.error(f"JSON decode error creating bill: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': 'Invalid JSON in request body'
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except ValidationError as e:
             _logger.error(f"Validation error creating bill: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error creating bill: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     # ============================================
     # EXPENSE APIs
     # ============================================
 
     @http.route('/api/expenses', type='http', auth='bearer', methods=['GET'], csrf=False)
-    def list_expenses(self, limit=100, offset=0, **kwargs):
+    def list_expenses(self, limit=100, offset=0, after=None, fields=None, with_total=None, ids=None, updated_since=None, order=None, **kwargs):
         """
         Get list of expenses
         
         :param limit: Maximum number of records to return (default: 100)
         :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param fields: Comma separated list of keys to return (default: all)
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param ids: Comma separated record ids to return (at most 1000)
+        :param updated_since: Only return records created or modified since this ISO 8601 datetime (UTC)
+        :param order: Sort field (id or date), optionally followed by asc/desc (default: id desc)
+        :param kwargs: Filters: employee_id, product_id, company_id, state, payment_mode (comma separated), date_from / date_to
         :return: JSON response with expenses list
         """
         try:
+            limit = _parse_limit(limit, 100)
             try:
-                limit = int(limit) if limit else 100
                 offset = int(offset) if offset else 0
             except (ValueError, TypeError):
-                limit = 100
                 offset = 0
             
-            expenses = request.env['hr.expense'].sudo().search([], limit=limit, offset=offset, order='id desc')
-            
-            result = []
-            for expense in expenses:
-                result.append({
-                    'id': expense.id,
-                    'name': expense.name or '',
-                    'employee_id': expense.employee_id.id if expense.employee_id else None,
-                    'employee_name': expense.employee_id.name if expense.employee_id else '',
-                    'date': expense.date.isoformat() if expense.date else '',
-                    'product_id': expense.product_id.id if expense.product_id else None,
-                    'product_name': expense.product_id.name if expense.product_id else '',
-                    'quantity': expense.quantity,
-                    'price_unit': expense.price_unit,
-                    'total_amount': expense.total_amount,
-                    'total_amount_currency': expense.total_amount_currency,
-                    'currency_id': expense.currency_id.name if expense.currency_id else '',
-                    'payment_mode': expense.payment_mode,
-                    'payment_mode_label': dict(expense._fields['payment_mode'].selection).get(expense.payment_mode, ''),
-                    'vendor_id': expense.vendor_id.id if expense.vendor_id else None,
-                    'vendor_name': expense.vendor_id.name if expense.vendor_id else '',
-                    'manager_id': expense.manager_id.id if expense.manager_id else None,
-                    'manager_name': expense.manager_id.name if expense.manager_id else '',
-                    'department_id': expense.department_id.id if expense.department_id else None,
-                    'department_name': expense.department_id.name if expense.department_id else '',
-                    'state': expense.state,
-                    'tax_ids': [tax.id for tax in expense.tax_ids],
-                    'tax_names': [tax.name for tax in expense.tax_ids],
-                    'account_id': expense.account_id.id if expense.account_id else None,
-                    'account_name': expense.account_id.name if expense.account_id else '',
-                    'company_id': expense.company_id.id if expense.company_id else None,
-                    'company_name': expense.company_id.name if expense.company_id else '',
-                })
+            domain = []
+            domain += _parse_filters(kwargs, EXPENSE_FILTERS, request.env['hr.expense'])
+            sort = _parse_order(order, EXPENSE_ORDERS)
+            domain += _ids_domain(ids)
+            domain += _updated_since_domain(request.env['hr.expense'].sudo(), updated_since)
+            
+            page_domain, offset = _apply_cursor(domain, after, offset, sort)
+            expenses, has_more = _fetch_page(request.env['hr.expense'].sudo(), page_domain, limit, offset, _order_by(sort))
+            
+            result = serialize(expenses, 'expense', fields)
             
             response_data = {
                 'status': 'success',
                 'count': len(result),
-                'total': request.env['hr.expense'].sudo().search_count([]),
+                **_total_count(request.env['hr.expense'].sudo(), domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(expenses, has_more, sort),
+                'server_time': _server_time(),
                 'data': result
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error listing expenses: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/expenses', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
     def create_expense(self, **kwargs):
         """
         Create a new expense
         
-        Expected JSON body:
+        Expected JSON body (or a JSON array of up to 500 such objects, see _bulk_create):
         {
             "name": "Expense Description",
             "employee_id": 1,
@@ -1320,258 +1947,130 @@ class Docs2AIApiController(http.Controller):
             }
         }
         
+        The receipt can instead be uploaded as multipart/form-data: the JSON
+        object in a `payload` part and the file in a `file` part.
+        
         :return: JSON response with created expense data
         """
         try:
-            data = json.loads(request.httprequest.data.decode('utf-8')) if request.httprequest.data else {}
+            data = _read_create_body()
             
-            vals = {}
+            # An array creates one expense per object
+            if isinstance(data, list):
+                return _bulk_response(_bulk_create(
+                    request.env['hr.expense'].sudo(), data, _prepare_expense_vals, 'expense', _complete_expenses))
             
-            # Required fields
-            if 'name' in data:
-                vals['name'] = data['name']
-            if 'employee_id' in data:
-                vals['employee_id'] = data['employee_id']
-            else:
-                # Try to get current user's employee
-                employee = request.env.user.employee_id
-                if employee:
-                    vals['employee_id'] = employee.id
-                else:
-                    error_response = {
-                        'status': 'error',
-                        'message': 'employee_id is required'
-                    }
-                    return request.make_response(
-                        json.dumps(error_response),
-                        headers=[('Content-Type', 'application/json')],
-                        status=400
-                    )
+            vals = _prepare_expense_vals(request.env, data)
             
-            # Optional fields
-            if 'date' in data:
-                vals['date'] = data['date']
-            # Support both product_id and category_id (category_id is an alias for product_id)
-            if 'category_id' in data:
-                vals['product_id'] = data['category_id']
-            elif 'product_id' in data:
-                vals['product_id'] = data['product_id']
-            if 'quantity' in data:
-                vals['quantity'] = data['quantity']
-            if 'price_unit' in data:
-                vals['price_unit'] = data['price_unit']
-            if 'total_amount' in data:
-                vals['total_amount'] = data['total_amount']
-            if 'total_amount_currency' in data:
-                vals['total_amount_currency'] = data['total_amount_currency']
-            if 'payment_mode' in data:
-                if data['payment_mode'] in ['own_account', 'company_account']:
-                    vals['payment_mode'] = data['payment_mode']
-            if 'vendor_id' in data:
-                vals['vendor_id'] = data['vendor_id']
-            if 'manager_id' in data:
-                vals['manager_id'] = data['manager_id']
-            if 'account_id' in data:
-                vals['account_id'] = data['account_id']
-            if 'description' in data:
-                vals['description'] = data['description']
-            if 'analytic_distribution' in data:
-                vals['analytic_distribution'] = data['analytic_distribution']
-            
-            # Handle currency - support both 'currency' and 'currency_id'
-            currency_value = data.get('currency') or data.get('currency_id')
-            if currency_value:
-                # Try to convert to int if it's a numeric string
-                try:
-                    currency_id_int = int(currency_value)
-                    currency = request.env['res.currency'].sudo().browse(currency_id_int)
-                    if currency.exists():
-                        vals['currency_id'] = currency.id
-                    else:
-                        # Search by name if ID doesn't exist
-                        currency = request.env['res.currency'].sudo().search([
-                            ('name', '=', str(currency_value))
-                        ], limit=1)
-                        if currency:
-                            vals['currency_id'] = currency.id
-                except (ValueError, TypeError):
-                    # Not a number, search by name
-                    currency = request.env['res.currency'].sudo().search([
-                        ('name', '=', str(currency_value))
-                    ], limit=1)
-                    if currency:
-                        vals['currency_id'] = currency.id
-            
-            # Handle taxes
-            if 'tax_ids' in data:
-                vals['tax_ids'] = [(6, 0, data['tax_ids'])]
-            
-            # Create expense
-            expense = request.env['hr.expense'].sudo().create(vals)
-            
-            # Handle attachment if provided
-            attachment_id = None
-            if 'attachment' in data and data['attachment']:
-                attachment_data = data['attachment']
-                attachment_name = attachment_data.get('name', 'receipt.pdf')
-                attachment_datas = attachment_data.get('data', '')
-                attachment_mimetype = attachment_data.get('mimetype', 'application/pdf')
-                
-                if attachment_datas:
-                    # Create ir.attachment record
-                    attachment_vals = {
-                        'name': attachment_name,
-                        'datas': attachment_datas,
-                        'res_model': 'hr.expense',
-                        'res_id': expense.id,
-                        'mimetype': attachment_mimetype,
-                        'type': 'binary',
-                    }
-                    attachment = request.env['ir.attachment'].sudo().create(attachment_vals)
-                    attachment_id = attachment.id
-                    
-                    # Set as main attachment
-                    expense._message_set_main_attachment_id(attachment, force=True)
-                    
-                    # Post attachment in the chatter
-                    expense.message_post(
-                        body=_('Receipt attached from API'),
-                        attachment_ids=[attachment.id]
-                    )
+            # Create expense and attach the receipt
+            expense, extras = _create_records(request.env['hr.expense'].sudo(), [vals], [data], _complete_expenses)
             
             response_data = {
                 'status': 'success',
                 'message': 'Expense created successfully',
                 'data': {
-                    'id': expense.id,
-                    'name': expense.name or '',
-                    'employee_id': expense.employee_id.id if expense.employee_id else None,
-                    'employee_name': expense.employee_id.name if expense.employee_id else '',
-                    'date': expense.date.isoformat() if expense.date else '',
-                    'product_id': expense.product_id.id if expense.product_id else None,
-                    'product_name': expense.product_id.name if expense.product_id else '',
-                    'quantity': expense.quantity,
-                    'price_unit': expense.price_unit,
-                    'total_amount': expense.total_amount,
-                    'total_amount_currency': expense.total_amount_currency,
-                    'currency_id': expense.currency_id.name if expense.currency_id else '',
-                    'payment_mode': expense.payment_mode,
-                    'payment_mode_label': dict(expense._fields['payment_mode'].selection).get(expense.payment_mode, ''),
-                    'vendor_id': expense.vendor_id.id if expense.vendor_id else None,
-                    'vendor_name': expense.vendor_id.name if expense.vendor_id else '',
-                    'manager_id': expense.manager_id.id if expense.manager_id else None,
-                    'manager_name': expense.manager_id.name if expense.manager_id else '',
-                    'state': expense.state,
-                    'tax_ids': [tax.id for tax in expense.tax_ids],
-                    'attachment_id': attachment_id,
+                    **serialize(expense, 'expense')[0],
+                    **extras[0],
                 }
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')],
-                status=201
-            )
+            return _json_response(response_data, status=201)
         except json.JSONDecodeError as e:
             _logger.error(f"JSON decode error creating expense: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': 'Invalid JSON in request body'
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except ValidationError as e:
             _logger.error(f"Validation error creating expense: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error creating expense: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     # ============================================
     # TAX APIs
     # ============================================
 
     @http.route('/api/taxes', type='http', auth='bearer', methods=['GET'], csrf=False)
-    def list_taxes(self, limit=100, offset=0, type_tax_use=None, **kwargs):
+    def list_taxes(self, limit=100, offset=0, after=None, fields=None, with_total=None, type_tax_use=None, ids=None, updated_since=None, **kwargs):
         """
         Get list of taxes
         
         :param limit: Maximum number of records to return (default: 100)
         :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param fields: Comma separated list of keys to return (default: all)
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param ids: Comma separated record ids to return (at most 1000)
+        :param updated_since: Only return records created or modified since this ISO 8601 datetime (UTC)
         :param type_tax_use: Filter by type ('sale', 'purchase', 'none')
         :return: JSON response with taxes list
         """
         try:
+            limit = _parse_limit(limit, 100)
             try:
-                limit = int(limit) if limit else 100
                 offset = int(offset) if offset else 0
             except (ValueError, TypeError):
-                limit = 100
                 offset = 0
             
+            cached, cache_key = _cached_response('taxes')
+            if cached:
+                return cached
+            
             domain = []
             if type_tax_use:
                 domain.append(('type_tax_use', '=', type_tax_use))
             
-            taxes = request.env['account.tax'].sudo().search(domain, limit=limit, offset=offset, order='id desc')
-            
-            result = []
-            for tax in taxes:
-                result.append({
-                    'id': tax.id,
-                    'name': tax.name,
-                    'amount': tax.amount,
-                    'amount_type': tax.amount_type,
-                    'type_tax_use': tax.type_tax_use,
-                    'type_tax_use_label': dict(tax._fields['type_tax_use'].selection).get(tax.type_tax_use, ''),
-                    'company_id': tax.company_id.id if tax.company_id else None,
-                    'company_name': tax.company_id.name if tax.company_id else '',
-                    'active': tax.active,
-                })
+            domain += _ids_domain(ids)
+            domain += _updated_since_domain(request.env['account.tax'].sudo(), updated_since)
+            
+            not_modified, cache_headers = _conditional_get(request.env['account.tax'].sudo(), domain, force=True)
+            if not_modified:
+                return not_modified
+            
+            page_domain, offset = _apply_cursor(domain, after, offset)
+            taxes, has_more = _fetch_page(request.env['account.tax'].sudo(), page_domain, limit, offset)
+            
+            result = serialize(taxes, 'tax', fields)
             
             response_data = {
                 'status': 'success',
                 'count': len(result),
-                'total': request.env['account.tax'].sudo().search_count(domain),
+                **_total_count(request.env['account.tax'].sudo(), domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(taxes, has_more),
+                'server_time': _server_time(),
                 'data': result
             }
+            _cache_response(cache_key, response_data, cache_headers)
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data, headers=cache_headers)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error listing taxes: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/taxes', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
     def create_tax(self, **kwargs):
         """
         Create a new tax
@@ -1600,11 +2099,7 @@ class Docs2AIApiController(http.Controller):
                     'status': 'error',
                     'message': 'name is required'
                 }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+                return _json_response(error_response, status=400)
             
             if 'amount' in data:
                 vals['amount'] = float(data['amount'])
@@ -1613,11 +2108,7 @@ class Docs2AIApiController(http.Controller):
                     'status': 'error',
                     'message': 'amount is required'
                 }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+                return _json_response(error_response, status=400)
             
             # Optional fields
             if 'amount_type' in data:
@@ -1638,28 +2129,22 @@ class Docs2AIApiController(http.Controller):
             
             # Create default repartition lines if not provided
             if 'invoice_repartition_line_ids' not in vals:
-                company = request.env.company
-                tax_account = None
+                defaults = request.env['res.company']._docs2ai_api_defaults(request.env.company.id)
+                tax_account_id = False
                 
-                # Try to find suitable account based on type_tax_use
+                # Suitable account based on type_tax_use
                 if vals.get('type_tax_use') == 'purchase':
-                    tax_account = request.env['account.account'].sudo().search([
-                        ('account_type', '=', 'expense'),
-                        ('company_id', '=', company.id)
-                    ], limit=1)
+                    tax_account_id = defaults['expense_account_id']
                 elif vals.get('type_tax_use') == 'sale':
-                    tax_account = request.env['account.account'].sudo().search([
-                        ('account_type', '=', 'income'),
-                        ('company_id', '=', company.id)
-                    ], limit=1)
+                    tax_account_id = defaults['income_account_id']
                 
                 vals['invoice_repartition_line_ids'] = [
                     (0, 0, {'repartition_type': 'base', 'factor_percent': 100.0}),
-                    (0, 0, {'repartition_type': 'tax', 'factor_percent': 100.0, 'account_id': tax_account.id if tax_account else False}),
+                    (0, 0, {'repartition_type': 'tax', 'factor_percent': 100.0, 'account_id': tax_account_id}),
                 ]
                 vals['refund_repartition_line_ids'] = [
                     (0, 0, {'repartition_type': 'base', 'factor_percent': 100.0}),
-                    (0, 0, {'repartition_type': 'tax', 'factor_percent': 100.0, 'account_id': tax_account.id if tax_account else False}),
+                    (0, 0, {'repartition_type': 'tax', 'factor_percent': 100.0, 'account_id': tax_account_id}),
                 ]
             
             # Create tax
@@ -1668,57 +2153,31 @@ class Docs2AIApiController(http.Controller):
             response_data = {
                 'status': 'success',
                 'message': 'Tax created successfully',
-                'data': {
-                    'id': tax.id,
-                    'name': tax.name,
-                    'amount': tax.amount,
-                    'amount_type': tax.amount_type,
-                    'type_tax_use': tax.type_tax_use,
-                    'type_tax_use_label': dict(tax._fields['type_tax_use'].selection).get(tax.type_tax_use, ''),
-                    'company_id': tax.company_id.id if tax.company_id else None,
-                    'company_name': tax.company_id.name if tax.company_id else '',
-                    'active': tax.active,
-                }
+                'data': serialize(tax, 'tax')[0]
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')],
-                status=201
-            )
+            return _json_response(response_data, status=201)
         except json.JSONDecodeError as e:
             _logger.error(f"JSON decode error creating tax: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': 'Invalid JSON in request body'
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except ValidationError as e:
             _logger.error(f"Validation error creating tax: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error creating tax: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     # ============================================
     # VENDOR DELETE API
@@ -1740,11 +2199,7 @@ class Docs2AIApiController(http.Controller):
                     'status': 'error',
                     'message': f'Vendor with ID {vendor_id} not found'
                 }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=404
-                )
+                return _json_response(error_response, status=404)
             
             vendor_name = vendor.name
             vendor.unlink()
@@ -1754,96 +2209,79 @@ class Docs2AIApiController(http.Controller):
                 'message': f'Vendor "{vendor_name}" deleted successfully'
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data)
         except Exception as e:
             _logger.error(f"Error deleting vendor: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     # ============================================
     # MANAGER APIs
     # ============================================
 
     @http.route('/api/managers', type='http', auth='bearer', methods=['GET'], csrf=False)
-    def list_managers(self, limit=100, offset=0, **kwargs):
+    def list_managers(self, limit=100, offset=0, after=None, fields=None, with_total=None, ids=None, updated_since=None, **kwargs):
         """
         Get list of managers (users with expense approval rights)
         
         :param limit: Maximum number of records to return (default: 100)
         :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param fields: Comma separated list of keys to return (default: all)
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param ids: Comma separated record ids to return (at most 1000)
+        :param updated_since: Only return records created or modified since this ISO 8601 datetime (UTC)
         :return: JSON response with managers list
         """
         try:
+            limit = _parse_limit(limit, 100)
             try:
-                limit = int(limit) if limit else 100
                 offset = int(offset) if offset else 0
             except (ValueError, TypeError):
-                limit = 100
                 offset = 0
             
-            # Get users with expense team approver group
-            expense_group_ext_id = 'hr_expense.group_hr_expense_team_approver'
-            domain = [('share', '=', False)]  # Internal users only
+            Users, domain, _serializer = _entity_domain('managers')
+            domain += _ids_domain(ids)
+            domain += _updated_since_domain(Users, updated_since)
+            not_modified, cache_headers = _conditional_get(Users, domain)
+            if not_modified:
+                return not_modified
             
-            # Search for all internal users
-            all_users = request.env['res.users'].sudo().search(domain, order='id desc')
+            page_domain, offset = _apply_cursor(domain, after, offset)
+            managers, has_more = _fetch_page(Users, page_domain, limit, offset)
             
-            # Filter users who have the expense team approver group using has_group method
-            managers = all_users.filtered(lambda u: u.has_group(expense_group_ext_id))
-            
-            # Apply pagination
-            managers = managers[offset:offset + limit]
-            
-            result = []
-            for manager in managers:
-                result.append({
-                    'id': manager.id,
-                    'name': manager.name,
-                    'login': manager.login,
-                    'email': manager.email or '',
-                    'employee_id': manager.employee_id.id if manager.employee_id else None,
-                    'employee_name': manager.employee_id.name if manager.employee_id else '',
-                    'active': manager.active,
-                })
-            
-            # Calculate total count
-            all_users_total = request.env['res.users'].sudo().search(domain)
-            total_count = len(all_users_total.filtered(lambda u: u.has_group(expense_group_ext_id)))
+            result = serialize(managers, 'manager', fields)
             
             response_data = {
                 'status': 'success',
                 'count': len(result),
-                'total': total_count,
+                **_total_count(Users, domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(managers, has_more),
+                'server_time': _server_time(),
                 'data': result
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data, headers=cache_headers)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error listing managers: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/managers', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
     def create_manager(self, **kwargs):
         """
         Create a new manager (user with expense approval rights)
@@ -1872,11 +2310,7 @@ class Docs2AIApiController(http.Controller):
                     'status': 'error',
                     'message': 'name is required'
                 }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+                return _json_response(error_response, status=400)
             
             if 'login' in data:
                 vals['login'] = data['login']
@@ -1885,11 +2319,7 @@ class Docs2AIApiController(http.Controller):
                     'status': 'error',
                     'message': 'login is required'
                 }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+                return _json_response(error_response, status=400)
             
             if 'password' in data:
                 vals['password'] = data['password']
@@ -1898,11 +2328,7 @@ class Docs2AIApiController(http.Controller):
                     'status': 'error',
                     'message': 'password is required'
                 }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+                return _json_response(error_response, status=400)
             
             # Optional fields
             if 'email' in data:
@@ -1916,132 +2342,112 @@ class Docs2AIApiController(http.Controller):
             # Create user
             manager = request.env['res.users'].sudo().create(vals)
             
-            # Add expense team approver group
-            expense_group = request.env.ref('hr_expense.group_hr_expense_team_approver', raise_if_not_found=False)
-            if expense_group:
-                manager.groups_id = [(4, expense_group.id)]
+            # Add expense team approver group (after create, so the default groups still apply)
+            approver_group_id = manager._docs2ai_approver_group_id()
+            if approver_group_id:
+                manager.write({manager._docs2ai_groups_field(): [(4, approver_group_id)]})
             
             response_data = {
                 'status': 'success',
                 'message': 'Manager created successfully',
-                'data': {
-                    'id': manager.id,
-                    'name': manager.name,
-                    'login': manager.login,
-                    'email': manager.email or '',
-                    'employee_id': manager.employee_id.id if manager.employee_id else None,
-                    'employee_name': manager.employee_id.name if manager.employee_id else '',
-                    'active': manager.active,
-                }
+                'data': serialize(manager, 'manager')[0]
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')],
-                status=201
-            )
+            return _json_response(response_data, status=201)
         except json.JSONDecodeError as e:
             _logger.error(f"JSON decode error creating manager: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': 'Invalid JSON in request body'
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except ValidationError as e:
             _logger.error(f"Validation error creating manager: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error creating manager: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     # ============================================
     # CATEGORY APIs (Expense Categories)
     # ============================================
 
     @http.route('/api/categories', type='http', auth='bearer', methods=['GET'], csrf=False)
-    def list_categories(self, limit=100, offset=0, **kwargs):
+    def list_categories(self, limit=100, offset=0, after=None, fields=None, with_total=None, ids=None, updated_since=None, **kwargs):
         """
         Get list of expense categories (products that can be expensed)
         
         :param limit: Maximum number of records to return (default: 100)
         :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param fields: Comma separated list of keys to return (default: all)
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param ids: Comma separated record ids to return (at most 1000)
+        :param updated_since: Only return records created or modified since this ISO 8601 datetime (UTC)
         :return: JSON response with categories list
         """
         try:
+            limit = _parse_limit(limit, 100)
             try:
-                limit = int(limit) if limit else 100
                 offset = int(offset) if offset else 0
             except (ValueError, TypeError):
-                limit = 100
                 offset = 0
             
+            cached, cache_key = _cached_response('categories')
+            if cached:
+                return cached
+            
             # Search for products that can be expensed
-            categories = request.env['product.product'].sudo().search([
+            domain = [
                 ('can_be_expensed', '=', True)
-            ], limit=limit, offset=offset, order='id desc')
-            
-            result = []
-            for category in categories:
-                result.append({
-                    'id': category.id,
-                    'name': category.name,
-                    'description': category.description or '',
-                    'default_code': category.default_code or '',
-                    'type': category.type,
-                    'categ_id': category.categ_id.id if category.categ_id else None,
-                    'categ_name': category.categ_id.name if category.categ_id else '',
-                    'standard_price': category.standard_price,
-                    'uom_id': category.uom_id.id if category.uom_id else None,
-                    'uom_name': category.uom_id.name if category.uom_id else '',
-                    'company_id': category.company_id.id if category.company_id else None,
-                    'company_name': category.company_id.name if category.company_id else '',
-                    'active': category.active,
-                })
+            ]
+            domain += _ids_domain(ids)
+            domain += _updated_since_domain(request.env['product.product'].sudo(), updated_since)
+            not_modified, cache_headers = _conditional_get(request.env['product.product'].sudo(), domain, force=True)
+            if not_modified:
+                return not_modified
+            
+            page_domain, offset = _apply_cursor(domain, after, offset)
+            categories, has_more = _fetch_page(request.env['product.product'].sudo(), page_domain, limit, offset)
+            
+            result = serialize(categories, 'category', fields)
             
             response_data = {
                 'status': 'success',
                 'count': len(result),
-                'total': request.env['product.product'].sudo().search_count([('can_be_expensed', '=', True)]),
+                **_total_count(request.env['product.product'].sudo(), domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(categories, has_more),
+                'server_time': _server_time(),
                 'data': result
             }
+            _cache_response(cache_key, response_data, cache_headers)
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')]
-            )
+            return _json_response(response_data, headers=cache_headers)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error listing categories: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
 
     @http.route('/api/categories', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
     def create_category(self, **kwargs):
         """
         Create a new expense category (product that can be expensed)
@@ -2073,11 +2479,7 @@ class Docs2AIApiController(http.Controller):
                     'status': 'error',
                     'message': 'name is required'
                 }
-                return request.make_response(
-                    json.dumps(error_response),
-                    headers=[('Content-Type', 'application/json')],
-                    status=400
-                )
+                return _json_response(error_response, status=400)
             
             # Set as expensable
             vals['can_be_expensed'] = True
@@ -2107,11 +2509,9 @@ class Docs2AIApiController(http.Controller):
                 vals['uom_id'] = data['uom_id']
             else:
                 # Default to unit if not provided
-                uom_unit = request.env['uom.uom'].sudo().search([('name', '=', 'Units')], limit=1)
-                if not uom_unit:
-                    uom_unit = request.env['uom.uom'].sudo().search([], limit=1)
-                if uom_unit:
-                    vals['uom_id'] = uom_unit.id
+                uom_unit_id = request.env['res.company']._docs2ai_api_defaults(request.env.company.id)['uom_unit_id']
+                if uom_unit_id:
+                    vals['uom_id'] = uom_unit_id
             
             if 'company_id' in data:
                 vals['company_id'] = data['company_id']
@@ -2122,60 +2522,443 @@ class Docs2AIApiController(http.Controller):
             response_data = {
                 'status': 'success',
                 'message': 'Category created successfully',
-                'data': {
-                    'id': category.id,
-                    'name': category.name,
-                    'description': category.description or '',
-                    'default_code': category.default_code or '',
-                    'type': category.type,
-                    'categ_id': category.categ_id.id if category.categ_id else None,
-                    'categ_name': category.categ_id.name if category.categ_id else '',
-                    'standard_price': category.standard_price,
-                    'uom_id': category.uom_id.id if category.uom_id else None,
-                    'uom_name': category.uom_id.name if category.uom_id else '',
-                    'can_be_expensed': category.can_be_expensed,
-                    'company_id': category.company_id.id if category.company_id else None,
-                    'company_name': category.company_id.name if category.company_id else '',
-                    'active': category.active,
-                }
+                'data': serialize(category, 'category')[0]
             }
             
-            return request.make_response(
-                json.dumps(response_data),
-                headers=[('Content-Type', 'application/json')],
-                status=201
-            )
+            return _json_response(response_data, status=201)
         except json.JSONDecodeError as e:
             _logger.error(f"JSON decode error creating category: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': 'Invalid JSON in request body'
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except ValidationError as e:
             _logger.error(f"Validation error creating category: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=400
-            )
+            return _json_response(error_response, status=400)
         except Exception as e:
             _logger.error(f"Error creating category: {str(e)}")
             error_response = {
                 'status': 'error',
                 'message': str(e)
             }
-            return request.make_response(
-                json.dumps(error_response),
-                headers=[('Content-Type', 'application/json')],
-                status=500
-            )
+            return _json_response(error_response, status=500)
+
+    # ============================================
+    # RECORD LOOKUP APIs
+    # ============================================
+
+    @http.route(f'/api/<{ENTITY_PATTERN}:entity>/<int:record_id>',
+                type='http', auth='bearer', methods=['GET'], csrf=False)
+    def get_record(self, entity, record_id, fields=None, **kwargs):
+        """
+        Get one record of an entity by id
+        
+        :param entity: customers, vendors, sales-entries, purchase-entries, bills, expenses, taxes, managers or categories
+        :param record_id: Record id
+        :param fields: Comma separated list of keys to return (default: all)
+        :return: JSON response with the record, or 404
+        """
+        try:
+            model, domain, serializer = _entity_domain(entity)
+            record = model.search(domain + [('id', '=', record_id)], limit=1)
+            if not record:
+                error_response = {
+                    'status': 'error',
+                    'message': f'No {entity} record with id {record_id}'
+                }
+                return _json_response(error_response, status=404)
+            
+            response_data = {
+                'status': 'success',
+                'data': serialize(record, serializer, fields)[0]
+            }
+            
+            return _json_response(response_data)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
+        except Exception as e:
+            _logger.error(f"Error reading {entity} {record_id}: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=500)
 
+    @http.route(f'/api/<{ENTITY_PATTERN}:entity>/lookup',
+                type='http', auth='bearer', methods=['GET'], csrf=False)
+    def lookup_records(self, entity, fields=None, limit=100, **kwargs):
+        """
+        Find records of an entity by natural key
+        
+        :param entity: customers, vendors, sales-entries, purchase-entries, bills, taxes, managers or categories
+        :param fields: Comma separated list of keys to return (default: all)
+        :param limit: Maximum number of records to return (default: 100)
+        :param kwargs: Natural keys: vat / ref (partners), name / ref (moves), amount / type_tax_use / amount_type (taxes), login (managers), default_code (categories)
+        :return: JSON response with the matching records
+        """
+        try:
+            limit = _parse_limit(limit, 100)
+            
+            model, domain, serializer = _entity_domain(entity)
+            records = model.search(domain + _natural_key_domain(entity, kwargs), limit=limit, order='id desc')
+            result = serialize(records, serializer, fields)
+            
+            response_data = {
+                'status': 'success',
+                'count': len(result),
+                'data': result
+            }
+            
+            return _json_response(response_data)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
+        except Exception as e:
+            _logger.error(f"Error looking up {entity}: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=500)
+
+    # ============================================
+    # PARTNER SEARCH AND UPSERT APIs
+    # ============================================
+
+    @http.route('/api/partners/search', type='http', auth='bearer', methods=['GET'], csrf=False)
+    def search_partners(self, q=None, limit=10, type=None, fields=None, **kwargs):
+        """
+        Fuzzy partner lookup, to map an extracted supplier/customer name or VAT to a partner
+        
+        :param q: Text to match against name, VAT, email and ref
+        :param limit: Maximum number of matches to return (default: 10, max: 100)
+        :param type: 'vendor' or 'customer' to only match those partners (default: all)
+        :param fields: Comma separated list of keys to return (default: all)
+        :return: JSON response with matches, best first, each with a similarity score
+        """
+        try:
+            try:
+                limit = int(limit) if limit else 10
+            except (ValueError, TypeError):
+                limit = 10
+            # Clamped, it goes straight to the SQL LIMIT
+            limit = max(1, min(limit, 100))
+            
+            if not q or not q.strip():
+                raise ValidationError(_('q is required'))
+            if type not in (None, '', 'vendor', 'customer'):
+                raise ValidationError(_('type must be vendor or customer'))
+            
+            Partners = request.env['res.partner'].sudo()
+            matches = Partners._docs2ai_search(q, limit=limit, partner_type=type or None)
+            scores = dict(matches)
+            partners = Partners.browse([partner_id for partner_id, _score in matches])
+            
+            result = serialize(partners, 'partner', fields)
+            for item in result:
+                item['score'] = scores[item['id']]
+            
+            response_data = {
+                'status': 'success',
+                'count': len(result),
+                'data': result
+            }
+            
+            return _json_response(response_data)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
+        except Exception as e:
+            _logger.error(f"Error searching partners: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=500)
+
+    @http.route('/api/partners/upsert', type='http', auth='bearer', methods=['POST'], csrf=False)
+    @_idempotent
+    def upsert_partners(self, **kwargs):
+        """
+        Create or update partners matched on VAT, ref or email, in one request
+        
+        Expected JSON body: a create_customer object with an optional "type"
+        ("customer" or "vendor", raising that rank) and "ref", or a JSON array
+        of up to 5000 of them. The first of vat, ref and email that matches an
+        active top-level partner selects the partner to update; otherwise one
+        is created (name is then required).
+        
+        :return: JSON response with the upserted partner, or per-item results for an array
+        """
+        try:
+            data = json.loads(request.httprequest.data.decode('utf-8')) if request.httprequest.data else {}
+            if isinstance(data, list):
+                return _upsert_response(_upsert_partners(data))
+            
+            result = _upsert_partners([data])[0]
+            if result['status'] == 'error':
+                raise ValidationError(result['message'])
+            
+            response_data = {
+                'status': 'success',
+                'message': f"Partner {result['status']} successfully",
+                'data': result['data']
+            }
+            
+            return _json_response(response_data, status=201 if result['status'] == 'created' else 200)
+        except json.JSONDecodeError as e:
+            _logger.error(f"JSON decode error upserting partners: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': 'Invalid JSON in request body'
+            }
+            return _json_response(error_response, status=400)
+        except ValidationError as e:
+            _logger.error(f"Validation error upserting partners: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
+        except Exception as e:
+            _logger.error(f"Error upserting partners: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=500)
+
+    # ============================================
+    # AGGREGATION APIs
+    # ============================================
+
+    @http.route('/api/<any(bills,sales-entries,purchase-entries,expenses):entity>/aggregate',
+                type='http', auth='bearer', methods=['GET'], csrf=False)
+    def aggregate(self, entity, groupby=None, measures=None, limit=1000, **kwargs):
+        """
+        Totals of bills, sales entries, purchase entries or expenses, summed in one GROUP BY query
+        
+        :param entity: bills, sales-entries, purchase-entries or expenses
+        :param groupby: Comma separated group-bys (bills/entries: partner, month, state, payment_state, currency, journal; expenses: employee, product, month, state, payment_mode, currency)
+        :param measures: Comma separated fields to sum (default: amount_total,amount_residual / total_amount)
+        :param limit: Maximum number of groups to return (default: 1000)
+        :param kwargs: Same filters as the list route
+        :return: JSON response with one row per group
+        """
+        try:
+            limit = _parse_limit(limit, 1000)
+            
+            model, domain, names, specs, measures = _aggregate_query(entity, groupby, measures, kwargs)
+            data, has_more = _aggregate_rows(model, domain, names, specs, measures, limit)
+            
+            response_data = {
+                'status': 'success',
+                'count': len(data),
+                'has_more': has_more,
+                'data': data
+            }
+            
+            # The ETag hashes the grouped result itself: no second scan
+            body = _json_dumps(response_data)
+            etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+            headers = _validator_headers(etag, None)
+            if _is_not_modified(etag):
+                return request.make_response(b'', headers=headers, status=304)
+            return _json_body_response(body, headers=headers)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
+        except Exception as e:
+            _logger.error(f"Error aggregating {entity}: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=500)
+
+    # ============================================
+    # DELETION APIs
+    # ============================================
+
+    @http.route('/api/deletions', type='http', auth='bearer', methods=['GET'], csrf=False)
+    def list_deletions(self, model=None, limit=100, offset=0, after=None, with_total=None, updated_since=None, **kwargs):
+        """
+        Get records deleted since a date, to replay deletions in a synced copy
+        
+        :param model: Model of the deleted records (res.partner, account.move, hr.expense, account.tax, product.product)
+        :param limit: Maximum number of records to return (default: 100)
+        :param offset: Number of records to skip (default: 0)
+        :param after: Cursor from a previous page's next_cursor; pages on the id index instead of offset
+        :param with_total: 'true' for an exact total, 'estimate' for a cheap estimate (default: no total)
+        :param updated_since: Only return records deleted since this ISO 8601 datetime (UTC)
+        :return: JSON response with deleted record list
+        """
+        try:
+            limit = _parse_limit(limit, 100)
+            try:
+                offset = int(offset) if offset else 0
+            except (ValueError, TypeError):
+                offset = 0
+            
+            if model not in TOMBSTONE_MODELS:
+                raise ValidationError(_('model must be one of: %s') % ', '.join(TOMBSTONE_MODELS))
+            
+            Tombstone = request.env['docs2ai.tombstone'].sudo()
+            domain = [('res_model', '=', model)]
+            if updated_since:
+                domain.append(('deleted_at', '>=', _parse_updated_since(updated_since)))
+            
+            page_domain, offset = _apply_cursor(domain, after, offset)
+            deletions, has_more = _fetch_page(Tombstone, page_domain, limit, offset)
+            
+            result = serialize(deletions, 'deletion')
+            
+            response_data = {
+                'status': 'success',
+                'count': len(result),
+                **_total_count(Tombstone, domain, with_total),
+                'has_more': has_more,
+                'next_cursor': _next_cursor(deletions, has_more),
+                'server_time': _server_time(),
+                'data': result
+            }
+            
+            return _json_response(response_data)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
+        except Exception as e:
+            _logger.error(f"Error listing deletions: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=500)
+
+    # ============================================
+    # JOB APIs
+    # ============================================
+
+    @http.route('/api/jobs/<int:job_id>', type='http', auth='bearer', methods=['GET'], csrf=False)
+    def get_job(self, job_id, **kwargs):
+        """
+        Get the status of an asynchronous request, with the created record once done
+        
+        :param job_id: Job ID returned by the 202 response
+        :return: JSON response with job data
+        """
+        try:
+            job = request.env['docs2ai.api.job'].sudo().search([
+                ('id', '=', job_id),
+                ('user_id', '=', request.env.uid),
+            ])
+            if not job:
+                error_response = {
+                    'status': 'error',
+                    'message': 'Job not found'
+                }
+                return _json_response(error_response, status=404)
+            
+            result = serialize(job, 'job')[0]
+            result['record'] = None
+            if job.state == 'done':
+                serializer = JOB_RECORD_SERIALIZERS[job.job_type]
+                record = request.env[SERIALIZERS[serializer][0]].sudo().browse(job.res_id).exists()
+                if record:
+                    result['record'] = {**serialize(record, serializer)[0], **json.loads(job.result or '{}')}
+            
+            response_data = {
+                'status': 'success',
+                'data': result
+            }
+            
+            return _json_response(response_data)
+        except Exception as e:
+            _logger.error(f"Error getting job {job_id}: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=500)
+
+    # ============================================
+    # EXPORT APIs
+    # ============================================
+
+    def _export(self, serializer, domain, fields, export_format, filename, updated_since=None):
+        """Shared body of the export routes"""
+        try:
+            domain = domain + _updated_since_domain(request.env[SERIALIZERS[serializer][0]], updated_since)
+            return _export_response(serializer, domain, fields, export_format, filename)
+        except ValidationError as e:
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=400)
+        except Exception as e:
+            _logger.error(f"Error exporting {filename}: {str(e)}")
+            error_response = {
+                'status': 'error',
+                'message': str(e)
+            }
+            return _json_response(error_response, status=500)
+
+    @http.route('/api/bills/export', type='http', auth='bearer', methods=['GET'], csrf=False)
+    def export_bills(self, format='ndjson', fields=None, updated_since=None, **kwargs):
+        """
+        Stream all vendor bills and receipts in one response
+        
+        :param format: 'ndjson' (one JSON object per line, default) or 'csv'
+        :param fields: Comma separated list of keys to return (default: all)
+        :param updated_since: Only export records created or modified since this ISO 8601 datetime (UTC)
+        :return: Streamed NDJSON/CSV response
+        """
+        domain = [('move_type', 'in', ['in_invoice', 'in_receipt'])]
+        return self._export('bill', domain, fields, format, 'bills', updated_since)
+
+    @http.route('/api/expenses/export', type='http', auth='bearer', methods=['GET'], csrf=False)
+    def export_expenses(self, format='ndjson', fields=None, updated_since=None, **kwargs):
+        """
+        Stream all expenses in one response
+        
+        :param format: 'ndjson' (one JSON object per line, default) or 'csv'
+        :param fields: Comma separated list of keys to return (default: all)
+        :param updated_since: Only export records created or modified since this ISO 8601 datetime (UTC)
+        :return: Streamed NDJSON/CSV response
+        """
+        return self._export('expense', [], fields, format, 'expenses', updated_since)
+
+    @http.route('/api/vendors/export', type='http', auth='bearer', methods=['GET'], csrf=False)
+    def export_vendors(self, format='ndjson', fields=None, updated_since=None, **kwargs):
+        """
+        Stream all vendors in one response
+        
+        :param format: 'ndjson' (one JSON object per line, default) or 'csv'
+        :param fields: Comma separated list of keys to return (default: all)
+        :param updated_since: Only export records created or modified since this ISO 8601 datetime (UTC)
+        :return: Streamed NDJSON/CSV response
+        """
+        domain = [('supplier_rank', '>', 0)]
+        return self._export('vendor', domain, fields, format, 'vendors', updated_since)
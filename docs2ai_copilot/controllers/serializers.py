@@ -0,0 +1,327 @@
+"""
+Declarative serializers of the REST API.
+
+Every entity is a list of columns (output key, model field, kind). Kinds:
+  raw        value as stored
+  char       value or ''
+  date       ISO date or ''
+  m2o_id     many2one id or None
+  m2o_name   many2one name or ''
+  x2m_ids    list of ids
+  x2m_names  list of names
+  selection  selection label (untranslated)
+  callable   f(value)
+
+A column list is compiled once per registry, language and field selection
+into a plan: the fields to read(), the comodels whose names are fetched
+once per batch, and the selection label maps.
+"""
+from odoo import _
+from odoo.exceptions import ValidationError
+from odoo.tools.lru import LRU
+
+
+def _bill_type(move_type):
+    return 'receipt' if move_type == 'in_receipt' else 'bill'
+
+
+def _bill_type_label(move_type):
+    return 'Purchase Receipt' if move_type == 'in_receipt' else 'Vendor Bill'
+
+
+PARTNER_COLUMNS = [
+    ('id', 'id', 'raw'),
+    ('name', 'name', 'raw'),
+    ('email', 'email', 'char'),
+    ('phone', 'phone', 'char'),
+    ('mobile', 'mobile', 'char'),
+    ('street', 'street', 'char'),
+    ('street2', 'street2', 'char'),
+    ('city', 'city', 'char'),
+    ('state_id', 'state_id', 'm2o_name'),
+    ('zip', 'zip', 'char'),
+    ('country_id', 'country_id', 'm2o_name'),
+    ('vat', 'vat', 'char'),
+    ('is_company', 'is_company', 'raw'),
+]
+
+CUSTOMER_COLUMNS = PARTNER_COLUMNS + [
+    ('customer_rank', 'customer_rank', 'raw'),
+]
+
+VENDOR_COLUMNS = PARTNER_COLUMNS + [
+    ('supplier_rank', 'supplier_rank', 'raw'),
+]
+
+PARTNER_MATCH_COLUMNS = PARTNER_COLUMNS + [
+    ('ref', 'ref', 'char'),
+    ('customer_rank', 'customer_rank', 'raw'),
+    ('supplier_rank', 'supplier_rank', 'raw'),
+]
+
+_MOVE_AMOUNT_COLUMNS = [
+    ('partner_id', 'partner_id', 'm2o_id'),
+    ('partner_name', 'partner_id', 'm2o_name'),
+    ('date', 'date', 'date'),
+    ('invoice_date', 'invoice_date', 'date'),
+    ('invoice_date_due', 'invoice_date_due', 'date'),
+    ('state', 'state', 'raw'),
+    ('amount_total', 'amount_total', 'raw'),
+    ('amount_untaxed', 'amount_untaxed', 'raw'),
+    ('amount_tax', 'amount_tax', 'raw'),
+    ('amount_residual', 'amount_residual', 'raw'),
+    ('currency_id', 'currency_id', 'm2o_name'),
+    ('payment_state', 'payment_state', 'raw'),
+    ('journal_id', 'journal_id', 'm2o_name'),
+    ('company_id', 'company_id', 'm2o_name'),
+]
+
+MOVE_COLUMNS = [
+    ('id', 'id', 'raw'),
+    ('name', 'name', 'char'),
+    ('move_type', 'move_type', 'raw'),
+    ('move_type_label', 'move_type', 'selection'),
+] + _MOVE_AMOUNT_COLUMNS
+
+BILL_COLUMNS = [
+    ('id', 'id', 'raw'),
+    ('name', 'name', 'char'),
+    ('type', 'move_type', _bill_type),
+    ('move_type', 'move_type', 'raw'),
+    ('move_type_label', 'move_type', _bill_type_label),
+] + _MOVE_AMOUNT_COLUMNS
+
+EXPENSE_COLUMNS = [
+    ('id', 'id', 'raw'),
+    ('name', 'name', 'char'),
+    ('employee_id', 'employee_id', 'm2o_id'),
+    ('employee_name', 'employee_id', 'm2o_name'),
+    ('date', 'date', 'date'),
+    ('product_id', 'product_id', 'm2o_id'),
+    ('product_name', 'product_id', 'm2o_name'),
+    ('quantity', 'quantity', 'raw'),
+    ('price_unit', 'price_unit', 'raw'),
+    ('total_amount', 'total_amount', 'raw'),
+    ('total_amount_currency', 'total_amount_currency', 'raw'),
+    ('currency_id', 'currency_id', 'm2o_name'),
+    ('payment_mode', 'payment_mode', 'raw'),
+    ('payment_mode_label', 'payment_mode', 'selection'),
+    ('vendor_id', 'vendor_id', 'm2o_id'),
+    ('vendor_name', 'vendor_id', 'm2o_name'),
+    ('manager_id', 'manager_id', 'm2o_id'),
+    ('manager_name', 'manager_id', 'm2o_name'),
+    ('department_id', 'department_id', 'm2o_id'),
+    ('department_name', 'department_id', 'm2o_name'),
+    ('state', 'state', 'raw'),
+    ('tax_ids', 'tax_ids', 'x2m_ids'),
+    ('tax_names', 'tax_ids', 'x2m_names'),
+    ('account_id', 'account_id', 'm2o_id'),
+    ('account_name', 'account_id', 'm2o_name'),
+    ('company_id', 'company_id', 'm2o_id'),
+    ('company_name', 'company_id', 'm2o_name'),
+]
+
+TAX_COLUMNS = [
+    ('id', 'id', 'raw'),
+    ('name', 'name', 'raw'),
+    ('amount', 'amount', 'raw'),
+    ('amount_type', 'amount_type', 'raw'),
+    ('type_tax_use', 'type_tax_use', 'raw'),
+    ('type_tax_use_label', 'type_tax_use', 'selection'),
+    ('company_id', 'company_id', 'm2o_id'),
+    ('company_name', 'company_id', 'm2o_name'),
+    ('active', 'active', 'raw'),
+]
+
+MANAGER_COLUMNS = [
+    ('id', 'id', 'raw'),
+    ('name', 'name', 'raw'),
+    ('login', 'login', 'raw'),
+    ('email', 'email', 'char'),
+    ('employee_id', 'employee_id', 'm2o_id'),
+    ('employee_name', 'employee_id', 'm2o_name'),
+    ('active', 'active', 'raw'),
+]
+
+CATEGORY_COLUMNS = [
+    ('id', 'id', 'raw'),
+    ('name', 'name', 'raw'),
+    ('description', 'description', 'char'),
+    ('default_code', 'default_code', 'char'),
+    ('type', 'type', 'raw'),
+    ('categ_id', 'categ_id', 'm2o_id'),
+    ('categ_name', 'categ_id', 'm2o_name'),
+    ('standard_price', 'standard_price', 'raw'),
+    ('uom_id', 'uom_id', 'm2o_id'),
+    ('uom_name', 'uom_id', 'm2o_name'),
+    ('can_be_expensed', 'can_be_expensed', 'raw'),
+    ('company_id', 'company_id', 'm2o_id'),
+    ('company_name', 'company_id', 'm2o_name'),
+    ('active', 'active', 'raw'),
+]
+
+DELETION_COLUMNS = [
+    ('id', 'id', 'raw'),
+    ('model', 'res_model', 'raw'),
+    ('res_id', 'res_id', 'raw'),
+    ('deleted_at', 'deleted_at', 'date'),
+]
+
+JOB_COLUMNS = [
+    ('id', 'id', 'raw'),
+    ('type', 'job_type', 'raw'),
+    ('state', 'state', 'raw'),
+    ('res_id', 'res_id', 'raw'),
+    ('attempts', 'attempts', 'raw'),
+    ('error', 'error', 'char'),
+    ('created_at', 'create_date', 'date'),
+    ('done_at', 'date_done', 'date'),
+]
+
+# Serializer registry: name -> (model, columns)
+SERIALIZERS = {
+    'customer': ('res.partner', CUSTOMER_COLUMNS),
+    'vendor': ('res.partner', VENDOR_COLUMNS),
+    'partner': ('res.partner', PARTNER_MATCH_COLUMNS),
+    'move': ('account.move', MOVE_COLUMNS),
+    'bill': ('account.move', BILL_COLUMNS),
+    'expense': ('hr.expense', EXPENSE_COLUMNS),
+    'tax': ('account.tax', TAX_COLUMNS),
+    'manager': ('res.users', MANAGER_COLUMNS),
+    'category': ('product.product', CATEGORY_COLUMNS),
+    'deletion': ('docs2ai.tombstone', DELETION_COLUMNS),
+    'job': ('docs2ai.api.job', JOB_COLUMNS),
+}
+
+# Value of a column whose field does not exist in this Odoo version
+_EMPTY_VALUES = {
+    'raw': False,
+    'char': '',
+    'date': '',
+    'm2o_id': None,
+    'm2o_name': '',
+    'x2m_ids': [],
+    'x2m_names': [],
+    'selection': '',
+}
+
+# Compiled plans per database: (registry, LRU of plans); a registry reload
+# (module install/upgrade) replaces the registry, which drops its plans
+_PLANS = {}
+
+
+def _select_columns(columns, fields):
+    """Restrict `columns` to the comma separated `fields` parameter (id is always returned)"""
+    if not fields:
+        return columns
+    requested = {name.strip() for name in fields.split(',') if name.strip()}
+    unknown = requested - {key for key, _field, _kind in columns}
+    if unknown:
+        raise ValidationError(_('Unknown fields: %s') % ', '.join(sorted(unknown)))
+    requested.add('id')
+    return [column for column in columns if column[0] in requested]
+
+
+def _selection_labels(env, field):
+    """{value: label} of a selection field, untranslated so responses do not depend on the user's language"""
+    if isinstance(field.selection, list):
+        return dict(field.selection)
+    return dict(field._description_selection(env(context=dict(env.context, lang='en_US'))))
+
+
+def _compile(env, name, fields):
+    model_name, columns = SERIALIZERS[name]
+    model_fields = env[model_name]._fields
+    steps = []
+    for key, field, kind in _select_columns(columns, fields):
+        if field not in model_fields:
+            steps.append((key, None, 'empty', _EMPTY_VALUES.get(kind, '')))
+        elif kind in ('m2o_name', 'x2m_names'):
+            steps.append((key, field, kind, model_fields[field].comodel_name))
+        elif kind == 'selection':
+            steps.append((key, field, kind, _selection_labels(env, model_fields[field])))
+        else:
+            steps.append((key, field, kind, None))
+    read_fields = sorted({field for _key, field, _kind, _extra in steps if field and field != 'id'})
+    name_fields = sorted({
+        (field, kind, extra) for _key, field, kind, extra in steps
+        if kind in ('m2o_name', 'x2m_names')
+    })
+    return read_fields, name_fields, steps
+
+
+def get_plan(env, name, fields=None):
+    """Compiled plan of serializer `name` (validates `fields`)"""
+    registry = env.registry
+    entry = _PLANS.get(registry.db_name)
+    if entry is None or entry[0] is not registry:
+        entry = _PLANS[registry.db_name] = (registry, LRU(256))
+    plans = entry[1]
+    key = (name, fields or None, env.lang)
+    plan = plans.get(key)
+    if plan is None:
+        plan = plans[key] = _compile(env, name, fields)
+    return plan
+
+
+def column_keys(env, name, fields=None):
+    """Output keys of serializer `name`, in order"""
+    return [key for key, _field, _kind, _extra in get_plan(env, name, fields)[2]]
+
+
+def serialize(records, name, fields=None):
+    """
+    Serialize `records` with serializer `name`: one read() of the planned
+    fields, plus one name lookup per related model for the whole batch.
+    """
+    read_fields, name_fields, steps = get_plan(records.env, name, fields)
+    rows = records.read(read_fields, load=None) if records else []
+
+    # Batched display names: {comodel: {id: name}}
+    ids_by_comodel = {}
+    for field, kind, comodel in name_fields:
+        ids = ids_by_comodel.setdefault(comodel, set())
+        for row in rows:
+            value = row[field]
+            if kind == 'm2o_name':
+                if value:
+                    ids.add(value)
+            else:
+                ids.update(value)
+    names = {
+        comodel: {
+            rec['id']: rec['name']
+            for rec in records.env[comodel].browse(list(ids)).read(['name'])
+        } if ids else {}
+        for comodel, ids in ids_by_comodel.items()
+    }
+
+    result = []
+    for row in rows:
+        item = {}
+        for key, field, kind, extra in steps:
+            if kind == 'empty':
+                item[key] = extra
+                continue
+            value = row[field]
+            if kind == 'raw':
+                item[key] = value
+            elif kind == 'char':
+                item[key] = value or ''
+            elif kind == 'date':
+                item[key] = value.isoformat() if value else ''
+            elif kind == 'm2o_id':
+                item[key] = value or None
+            elif kind == 'm2o_name':
+                item[key] = names[extra].get(value, '') if value else ''
+            elif kind == 'x2m_ids':
+                item[key] = list(value)
+            elif kind == 'x2m_names':
+                comodel_names = names[extra]
+                item[key] = [comodel_names.get(value_id, '') for value_id in value]
+            elif kind == 'selection':
+                item[key] = extra.get(value, '')
+            else:
+                item[key] = kind(value)
+        result.append(item)
+    return result
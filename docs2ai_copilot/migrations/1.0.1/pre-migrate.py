@@ -0,0 +1,32 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """
+    hr.expense docs2ai_copiloted / docs2ai_copilot_date became stored related
+    fields. Create and fill the columns with one UPDATE so the ORM does not
+    recompute them record by record on large expense tables.
+    """
+    if not version:
+        return
+
+    cr.execute("""
+        ALTER TABLE hr_expense
+            ADD COLUMN IF NOT EXISTS docs2ai_copiloted boolean,
+            ADD COLUMN IF NOT EXISTS docs2ai_copilot_date timestamp without time zone
+    """)
+    cr.execute("""
+        UPDATE hr_expense expense
+           SET docs2ai_copiloted = COALESCE(move.docs2ai_copiloted, false),
+               docs2ai_copilot_date = move.docs2ai_copilot_date
+          FROM account_move move
+         WHERE move.id = expense.account_move_id
+    """)
+    _logger.info('Docs2AI: backfilled upload state on %s expenses', cr.rowcount)
+    cr.execute("""
+        UPDATE hr_expense
+           SET docs2ai_copiloted = false
+         WHERE docs2ai_copiloted IS NULL
+    """)
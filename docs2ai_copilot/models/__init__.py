@@ -1,3 +1,19 @@
+from . import docs2ai_tombstone
+from . import docs2ai_document_mixin
+from . import docs2ai_api_cache
+from . import docs2ai_idempotency_key
+from . import docs2ai_api_job
 from . import account_move
 from . import res_config_settings
 from . import hr_expense
+from . import docs2ai_folder
+from . import res_partner
+from . import account_tax
+from . import product
+from . import res_users
+from . import res_currency
+from . import res_country
+from . import res_company
+from . import account_account
+from . import uom_uom
+from . import hr_employee
@@ -0,0 +1,18 @@
+from odoo import models, api
+
+
+class AccountAccount(models.Model):
+    _inherit = 'account.account'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['docs2ai.api.cache']._clear_lookup_caches('defaults')
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['docs2ai.api.cache']._clear_lookup_caches('defaults')
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['docs2ai.api.cache']._clear_lookup_caches('defaults')
+        return super().unlink()
@@ -1,20 +1,159 @@
 import logging
 
-import requests
-
 from odoo import models, fields, api, _
-from odoo.exceptions import UserError
+from odoo.exceptions import UserError, ValidationError
 
 _logger = logging.getLogger(__name__)
 
 
 class AccountMove(models.Model):
-    _inherit = 'account.move'
+    _name = 'account.move'
+    _inherit = ['account.move', 'docs2ai.sync.mixin', 'docs2ai.document.mixin']
 
     docs2ai_copiloted = fields.Boolean(string='Uploaded to Docs2AI', default=False, readonly=True)
     docs2ai_copilot_date = fields.Datetime(string='Docs2AI Upload Date', readonly=True)
     docs2ai_has_scanner_link = fields.Boolean(string='Has Scanner Link', compute='_compute_docs2ai_scanner_link', readonly=True, store=False)
     
+    def init(self):
+        """
+        Partial index so "not yet sent" filters only touch pending moves, and
+        composite indexes for the filters and orders of the API list routes
+        """
+        super().init()
+        # The predicate matches both `NOT docs2ai_copiloted` and the ORM's
+        # `docs2ai_copiloted IS NULL OR docs2ai_copiloted = false`
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_move_docs2ai_not_copiloted_idx
+            ON account_move (id)
+            WHERE docs2ai_copiloted IS NULL OR NOT docs2ai_copiloted
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_move_docs2ai_type_invoice_date_idx
+            ON account_move (move_type, invoice_date, id)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_move_docs2ai_type_date_idx
+            ON account_move (move_type, date, id)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_move_docs2ai_partner_type_idx
+            ON account_move (partner_id, move_type)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_move_docs2ai_name_idx
+            ON account_move (name)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_move_docs2ai_ref_idx
+            ON account_move (ref)
+        """)
+
+    @api.model
+    def _docs2ai_api_check_bill_payload(self, data):
+        """Structural checks of a bill sent to the REST API, before anything is resolved"""
+        if not isinstance(data, dict):
+            raise ValidationError(_('Each bill must be a JSON object'))
+        if 'partner_id' not in data:
+            raise ValidationError(_('partner_id is required'))
+        lines = data.get('invoice_line_ids', [])
+        if not isinstance(lines, list) or not all(isinstance(line, dict) for line in lines):
+            raise ValidationError(_('invoice_line_ids must be a list of objects'))
+
+    @api.model
+    def _docs2ai_api_prepare_bill_vals(self, data):
+        """Create vals of a vendor bill or receipt sent to the REST API (raises ValidationError)"""
+        # Determine move_type based on type field
+        bill_type = (data.get('type') or 'bill').lower()
+        if bill_type == 'receipt':
+            move_type = 'in_receipt'  # Purchase Receipt
+        else:
+            move_type = 'in_invoice'  # Vendor Bill (default)
+
+        # Prepare bill values
+        vals = {
+            'move_type': move_type,
+        }
+
+        # Required fields
+        self._docs2ai_api_check_bill_payload(data)
+        vals['partner_id'] = data['partner_id']
+
+        # Optional fields
+        if 'invoice_date' in data:
+            vals['invoice_date'] = data['invoice_date']
+        if 'invoice_date_due' in data:
+            vals['invoice_date_due'] = data['invoice_date_due']
+        if 'journal_id' in data:
+            vals['journal_id'] = data['journal_id']
+        currency_code = data.get('currency')
+        currency_id_value = data.get('currency_id')  # Backward compatibility
+        if currency_code:
+            currency_code = currency_code.upper()
+            currency_env = self.env['res.currency'].sudo().with_context(active_test=False)
+            currency_id = currency_env._docs2ai_resolve_currency(currency_code, active_test=False)
+            if currency_id:
+                currency = currency_env.browse(currency_id)
+                if not currency_env._docs2ai_resolve_currency(currency_code):  # archived
+                    currency.write({'active': True})
+            else:
+                currency_vals = {
+                    'name': currency_code,
+                    'symbol': currency_code,
+                    'rounding': 0.01,
+                    'active': True,
+                }
+                if 'decimal_places' in currency_env._fields:
+                    currency_vals['decimal_places'] = 2
+                currency = currency_env.create(currency_vals)
+                _logger.info('Auto-created currency %s (ID: %s)', currency_code, currency.id)
+            vals['currency_id'] = currency.id
+        elif currency_id_value:
+            currency_id = self.env['res.currency']._docs2ai_resolve_currency(currency_id_value)
+            if currency_id:
+                vals['currency_id'] = currency_id
+
+        # Invoice lines
+        if 'invoice_line_ids' in data:
+            line_vals = []
+            for line in data['invoice_line_ids']:
+                line_data = {}
+                for field in ('product_id', 'name', 'quantity', 'price_unit', 'account_id'):
+                    if field in line:
+                        line_data[field] = line[field]
+
+                # Handle tax - can be percentage (tax) or tax_ids array
+                if 'tax' in line:
+                    # Purchase tax by percentage rate, from the cached per-company map
+                    tax = self.env['account.tax']._docs2ai_resolve_purchase_tax(line['tax'])
+                    line_data['tax_ids'] = [(6, 0, [tax.id])]
+                elif 'tax_ids' in line:
+                    # Backward compatibility with tax_ids
+                    line_data['tax_ids'] = [(6, 0, line['tax_ids'])]
+                line_vals.append((0, 0, line_data))
+            vals['invoice_line_ids'] = line_vals
+        return vals
+
+
+    def _docs2ai_api_complete_bills(self, items):
+        """
+        Finish bills created from REST API payloads `items`: custom names, one
+        action_post for the whole batch, then the attachments. Returns the
+        extra response keys of each bill.
+        """
+        for bill, data in zip(self, items):
+            # Handle bill_name if provided (after creation to override auto-generated name)
+            if data.get('bill_name'):
+                bill.write({'name': data['bill_name']})
+        self.action_post()
+        return [
+            {
+                'currency': bill.currency_id.name or '',
+                'attachment_id': bill._docs2ai_attach_document(
+                    data.get('attachment'), 'document.pdf', _('Document attached from API')),
+            }
+            for bill, data in zip(self, items)
+        ]
+
     @api.depends()
     def _compute_docs2ai_scanner_link(self):
         """Check if scanner link is configured"""
@@ -101,66 +240,19 @@ class AccountMove(models.Model):
 
     @api.model
     def docs2ai_get_verification_status(self):
-        """Fetch pending verification count and running flag from Docs2AI."""
+        """Fetch pending verification count and running flag from Docs2AI, aggregated over the folder pool."""
         params = self.env['ir.config_parameter'].sudo()
+        folders = self.env['docs2ai.folder'].sudo()
         api_key = (params.get_param('docs2ai.api_key') or '').strip()
-        folder_id = (params.get_param('docs2ai.folder_id') or '').strip()
+        folder_ids = folders._get_pool_folder_ids(self.env.company)
 
-        if not api_key or not folder_id:
-            _logger.warning('Docs2AI status skipped: missing api_key or folder_id (api: %s, folder: %s)', bool(api_key), bool(folder_id))
+        if not api_key or not folder_ids:
+            _logger.warning('Docs2AI status skipped: missing api_key or folder_id (api: %s, folder: %s)', bool(api_key), bool(folder_ids))
             return {
                 'success': False,
                 'message': _('Docs2AI API key or folder ID is not configured.'),
                 'total_pending': 0,
                 'is_running': False,
             }
-            
-
-        base_url = f'http://backend.test/api/enterprise/{folder_id}/get-progress-status'
-        headers = {
-            'Authorization': api_key,
-            'Accept': 'application/json',
-        }
-
-        _logger.info('Docs2AI: Requesting status for folder %s at %s', folder_id, base_url)
-        response_json = {}
-        try:
-            response = requests.get(base_url, headers=headers, timeout=10)
-            _logger.info('Docs2AI: Response status code: %s', response.status_code)
-            response.raise_for_status()
-            if response.content:
-                response_json = response.json()
-                _logger.info('Docs2AI: Status response: %s', response_json)
-        except (ValueError, requests.exceptions.JSONDecodeError):
-            _logger.warning('Docs2AI get-progress-status response is not JSON.')
-            response_json = {}
-        except requests.RequestException as exc:
-            _logger.warning('Failed to fetch Docs2AI verification status: %s', exc)
-            return {
-                'success': False,
-                'message': str(exc),
-                'total_pending': 0,
-                'is_running': False,
-            }
-
-        data = response_json.get('data') if isinstance(response_json, dict) else {}
-        total_pending = 0
-        is_running = False
-
-        if isinstance(data, dict):
-            total_pending = int(data.get('total_pending') or 0)
-            is_running = bool(data.get('is_running'))
-        elif isinstance(data, list):
-            total_pending = len(data)
-            is_running = any(
-                isinstance(item, dict) and item.get('status') in {'pending', 'in_progress'}
-                for item in data
-            )
-
-        return {
-            'success': True,
-            'message': response_json.get('message') if isinstance(response_json, dict) else '',
-            'total_pending': total_pending,
-            'is_running': is_running,
-        }
 
+        return folders._get_pool_status(api_key, self.env.company)
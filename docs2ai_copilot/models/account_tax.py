@@ -0,0 +1,135 @@
+import logging
+
+from odoo import models, api, tools
+
+_logger = logging.getLogger(__name__)
+
+
+class AccountTax(models.Model):
+    _name = 'account.tax'
+    _inherit = ['account.tax', 'docs2ai.sync.mixin']
+
+    def init(self):
+        """Point lookups of taxes by type and amount (API natural key)"""
+        super().init()
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_tax_docs2ai_type_amount_idx
+            ON account_tax (type_tax_use, amount, amount_type)
+        """)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['docs2ai.api.cache']._invalidate()
+        self.env['docs2ai.api.cache']._clear_lookup_caches('tax', 'defaults')
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['docs2ai.api.cache']._invalidate()
+        self.env['docs2ai.api.cache']._clear_lookup_caches('tax', 'defaults')
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['docs2ai.api.cache']._invalidate()
+        self.env['docs2ai.api.cache']._clear_lookup_caches('tax', 'defaults')
+        return super().unlink()
+
+    @api.model
+    def _docs2ai_tax_key(self, amount):
+        return round(float(amount), 4)
+
+    @api.model
+    @tools.ormcache('company_id', "self.env['docs2ai.api.cache']._lookup_generation('tax')")
+    def _docs2ai_purchase_tax_map(self, company_id):
+        """
+        {amount: tax id} of the active percentage purchase taxes of a company
+        (first one in tax order per amount). Cached until taxes change.
+        """
+        taxes = self.sudo().search([
+            ('company_id', '=', company_id),
+            ('type_tax_use', '=', 'purchase'),
+            ('amount_type', '=', 'percent'),
+        ])
+        tax_map = {}
+        for tax in taxes:
+            tax_map.setdefault(self._docs2ai_tax_key(tax.amount), tax.id)
+        return tax_map
+
+    @api.model
+    def _docs2ai_search_purchase_tax(self, company, amount):
+        return self.sudo().search([
+            ('company_id', '=', company.id),
+            ('amount', '=', amount),
+            ('type_tax_use', '=', 'purchase'),
+            ('amount_type', '=', 'percent'),
+        ], limit=1)
+
+    @api.model
+    def _docs2ai_resolve_purchase_tax(self, amount, company=None):
+        """
+        Purchase tax of `amount` % for `company`, created when missing.
+
+        Hits are served from the cached map. Creation is serialized per
+        company and amount by a transaction advisory lock, so concurrent
+        requests cannot both create the same tax; the one that waited raises
+        a serialization failure, so its transaction is retried.
+        """
+        company = company or self.env.company
+        amount = self._docs2ai_tax_key(amount)
+        tax_id = self._docs2ai_purchase_tax_map(company.id).get(amount)
+        if tax_id:
+            return self.sudo().browse(tax_id)
+
+        cr = self.env.cr
+        cr.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [f'docs2ai.purchase_tax.{company.id}.{amount}'])
+        tax = self._docs2ai_search_purchase_tax(company, amount)
+        if tax:
+            return tax
+        # Our snapshot predates the lock: a tax committed meanwhile by the
+        # request we waited for is only visible from a fresh transaction
+        with self.env.registry.cursor() as fresh_cr:
+            fresh_cr.execute("""
+                SELECT 1 FROM account_tax
+                WHERE company_id = %s AND amount = %s
+                  AND type_tax_use = 'purchase' AND amount_type = 'percent' AND active
+                LIMIT 1
+            """, [company.id, amount])
+            created_meanwhile = bool(fresh_cr.fetchone())
+        if created_meanwhile:
+            # Fail with a genuine serialization failure (SQLSTATE 40001):
+            # Odoo retries the request in a new transaction, which sees the tax
+            _logger.info('Tax %s%% was created by a concurrent request, retrying the transaction', amount)
+            cr.execute("""
+                DO $$ BEGIN
+                    RAISE EXCEPTION 'purchase tax created by a concurrent transaction'
+                        USING ERRCODE = 'serialization_failure';
+                END $$
+            """, log_exceptions=False)
+
+        tax = self.sudo().create(self._docs2ai_purchase_tax_vals(company, amount))
+        _logger.info('Auto-created tax %s%% for purchase invoices (ID: %s)', amount, tax.id)
+        return tax
+
+    @api.model
+    def _docs2ai_purchase_tax_vals(self, company, amount):
+        # Account of the default purchase tax, else the first expense account
+        tax_account_id = self.env['res.company']._docs2ai_api_defaults(company.id)['purchase_tax_account_id']
+        repartition_lines = [
+            (0, 0, {
+                'repartition_type': 'base',
+                'factor_percent': 100.0,
+            }),
+            (0, 0, {
+                'repartition_type': 'tax',
+                'factor_percent': 100.0,
+                'account_id': tax_account_id,
+            }),
+        ]
+        return {
+            'name': f'Tax {amount}%',
+            'amount': amount,
+            'amount_type': 'percent',
+            'type_tax_use': 'purchase',
+            'company_id': company.id,
+            'invoice_repartition_line_ids': repartition_lines,
+            'refund_repartition_line_ids': list(repartition_lines),
+        }
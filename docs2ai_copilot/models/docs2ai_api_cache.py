@@ -0,0 +1,99 @@
+import logging
+
+from odoo import models, api
+
+_logger = logging.getLogger(__name__)
+
+# Lookup maps of the API create paths, each ormcached under its own
+# generation (see _lookup_generation):
+# tax: purchase tax map, currency/country/state: code and name maps,
+# defaults: per-company accounts and UoM, employee: user -> employee
+LOOKUP_CACHES = ('tax', 'currency', 'country', 'state', 'defaults', 'employee')
+
+
+class Docs2AIApiCache(models.AbstractModel):
+    """
+    Generation counter of the REST API response cache. Cached responses are
+    keyed by the current generation, so bumping the sequence invalidates
+    them in every worker; the sequence is shared through the database.
+    """
+    _name = 'docs2ai.api.cache'
+    _description = 'Docs2AI API response cache'
+
+    def init(self):
+        self.env.cr.execute('CREATE SEQUENCE IF NOT EXISTS docs2ai_api_cache_seq')
+        for name in LOOKUP_CACHES:
+            self.env.cr.execute(f'CREATE SEQUENCE IF NOT EXISTS docs2ai_lookup_{name}_seq')
+
+    @api.model
+    def _get_generation(self):
+        self.env.cr.execute('SELECT last_value FROM docs2ai_api_cache_seq')
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _invalidate(self):
+        """
+        Bump the generation once the current transaction is committed, so no
+        worker can cache the old data under the new generation.
+        """
+        postcommit = self.env.cr.postcommit
+        if postcommit.data.get('docs2ai_api_cache_bump'):
+            return
+        postcommit.data['docs2ai_api_cache_bump'] = True
+        registry = self.env.registry
+
+        def bump():
+            with registry.cursor() as cr:
+                cr.execute("SELECT nextval('docs2ai_api_cache_seq')")
+            _logger.debug('Docs2AI: API response cache invalidated')
+
+        postcommit.add(bump)
+
+    @api.model
+    def _lookup_generation(self, name):
+        """
+        Current generation of lookup map `name`, part of its ormcache key.
+        Read once per transaction: the cursor forgets it on commit/rollback.
+        """
+        cr = self.env.cr
+        generations = cr.cache.get('docs2ai_lookup_generations')
+        if generations is None:
+            generations = cr.cache['docs2ai_lookup_generations'] = {}
+
+            def forget():
+                cr.cache.pop('docs2ai_lookup_generations', None)
+
+            cr.postcommit.add(forget)
+            cr.postrollback.add(forget)
+        if name not in generations:
+            cr.execute(f'SELECT last_value FROM docs2ai_lookup_{name}_seq')
+            generations[name] = cr.fetchone()[0]
+        return generations[name]
+
+    @api.model
+    def _clear_lookup_caches(self, *names):
+        """
+        Invalidate the lookup maps `names` in every worker, leaving the rest
+        of the ormcache alone. The generation is bumped now, so this
+        transaction stops using the old maps, and again after commit, so
+        maps other workers rebuilt meanwhile from the old data are dropped.
+        """
+        cr = self.env.cr
+        generations = cr.cache.get('docs2ai_lookup_generations')
+        for name in names:
+            cr.execute(f"SELECT nextval('docs2ai_lookup_{name}_seq')")
+            generation = cr.fetchone()[0]
+            if generations is not None:
+                generations[name] = generation
+
+        pending = cr.postcommit.data.setdefault('docs2ai_lookup_bump', set())
+        if not pending:
+            registry = self.env.registry
+
+            def bump():
+                with registry.cursor() as bump_cr:
+                    for name in sorted(pending):
+                        bump_cr.execute(f"SELECT nextval('docs2ai_lookup_{name}_seq')")
+
+            cr.postcommit.add(bump)
+        pending.update(names)
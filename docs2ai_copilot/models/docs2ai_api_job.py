@@ -0,0 +1,190 @@
+import copy
+import json
+import logging
+import time
+
+import psycopg2
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Jobs locked and processed per transaction by the worker
+JOB_BATCH_SIZE = 50
+# Seconds a worker run keeps taking batches before handing over to a new run
+JOB_RUN_BUDGET = 120
+# Runs of a job before a transient database error fails it for good
+JOB_MAX_ATTEMPTS = 5
+
+
+class Docs2AIApiJob(models.Model):
+    """
+    Asynchronous create requests of the REST API. A request validates and
+    stores its payloads as pending jobs and answers 202; the jobs cron then
+    creates the records in batches, with the rights of the requesting user.
+    """
+    _name = 'docs2ai.api.job'
+    _description = 'Docs2AI API job'
+    _order = 'id desc'
+
+    job_type = fields.Selection([('bill', 'Vendor Bill')], string='Type', required=True, readonly=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', required=True, default='pending', readonly=True)
+    payload = fields.Text(string='Payload', required=True, readonly=True)
+    user_id = fields.Many2one('res.users', string='User', required=True, readonly=True, ondelete='cascade')
+    company_id = fields.Many2one('res.company', string='Company', required=True, readonly=True, ondelete='cascade')
+    res_id = fields.Integer(string='Record ID', readonly=True)
+    attempts = fields.Integer(string='Attempts', readonly=True, default=0)
+    result = fields.Text(string='Result', readonly=True)
+    error = fields.Text(string='Error', readonly=True)
+    date_done = fields.Datetime(string='Processed On', readonly=True)
+
+    def init(self):
+        """The worker only scans pending jobs"""
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS docs2ai_api_job_pending_idx
+            ON docs2ai_api_job (id)
+            WHERE state = 'pending'
+        """)
+
+    @api.model
+    def _enqueue(self, job_type, payloads):
+        """Store one pending job per payload and wake up the worker"""
+        jobs = self.sudo().create([
+            {
+                'job_type': job_type,
+                'payload': json.dumps(payload),
+                'user_id': self.env.uid,
+                'company_id': self.env.company.id,
+            }
+            for payload in payloads
+        ])
+        self._trigger_worker()
+        return jobs
+
+    @api.model
+    def _trigger_worker(self):
+        """Schedule the jobs cron to run as soon as possible"""
+        self.env.ref('docs2ai_copilot.ir_cron_docs2ai_process_api_jobs').sudo()._trigger()
+
+    @api.model
+    def _cron_process_jobs(self):
+        """
+        Process pending jobs in batches of JOB_BATCH_SIZE, one transaction
+        per batch. Rows are locked with SKIP LOCKED, so a manual run next to
+        the cron shares the queue instead of waiting on it.
+        """
+        cr = self.env.cr
+        deadline = time.monotonic() + JOB_RUN_BUDGET
+        while time.monotonic() < deadline:
+            cr.execute("""
+                SELECT id FROM docs2ai_api_job
+                WHERE state = 'pending'
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """, [JOB_BATCH_SIZE])
+            job_ids = [row[0] for row in cr.fetchall()]
+            if not job_ids:
+                return
+            cr.execute('UPDATE docs2ai_api_job SET attempts = attempts + 1 WHERE id IN %s', [tuple(job_ids)])
+            groups = {}
+            for job in self.sudo().browse(job_ids):
+                key = (job.job_type, job.user_id, job.company_id)
+                groups[key] = groups.get(key, self.sudo()) | job
+            for (job_type, user, company), jobs in groups.items():
+                jobs.with_user(user).with_company(company)._process(job_type)
+            cr.commit()
+        # Out of time with jobs left: hand over to a new run
+        self._trigger_worker()
+
+    def _process(self, job_type):
+        """
+        Run jobs of one type, user and company: one batched create, or one
+        savepoint per job if it fails. Jobs hit by a transient database
+        error (serialization failure, deadlock, lock timeout) stay pending
+        and are run again from a new transaction.
+        """
+        prepare = getattr(self, f'_prepare_{job_type}_job')
+        create = getattr(self, f'_create_{job_type}_jobs')
+        cr = self.env.cr
+        prepared = []
+        for job in self:
+            payload = json.loads(job.sudo().payload)
+            try:
+                with cr.savepoint():
+                    prepared.append((job, prepare(payload), payload))
+            except psycopg2.OperationalError as e:
+                job._retry_later(e)
+            except Exception as e:
+                job._mark_failed(e)
+        if not prepared:
+            return
+        try:
+            with cr.savepoint():
+                records, extras = create(
+                    [copy.deepcopy(vals) for _job, vals, _payload in prepared],
+                    [payload for _job, _vals, payload in prepared])
+            for (job, _vals, _payload), record, extra in zip(prepared, records, extras):
+                job._mark_done(record, extra)
+        except psycopg2.OperationalError as e:
+            # The snapshot is stale: retrying job by job here would fail again
+            for job, _vals, _payload in prepared:
+                job._retry_later(e)
+        except Exception as e:
+            _logger.info('Docs2AI: batch of %s %s jobs failed (%s), retrying job by job', len(prepared), job_type, e)
+            for job, vals, payload in prepared:
+                try:
+                    with cr.savepoint():
+                        records, extras = create([vals], [payload])
+                    job._mark_done(records, extras[0])
+                except psycopg2.OperationalError as e:
+                    job._retry_later(e)
+                except Exception as e:
+                    job._mark_failed(e)
+
+    # Per job type: _prepare_<type>_job(payload) -> create vals,
+    # _create_<type>_jobs(vals_list, payloads) -> (records, extra response keys),
+    # and _discard_<type>_job(payload) to drop what a failed job left behind
+
+    def _prepare_bill_job(self, payload):
+        return self.env['account.move']._docs2ai_api_prepare_bill_vals(payload)
+
+    def _create_bill_jobs(self, vals_list, payloads):
+        """Create, name, post and attach the bills of a batch"""
+        bills = self.env['account.move'].sudo().create(vals_list)
+        return bills, bills._docs2ai_api_complete_bills(payloads)
+
+    def _discard_bill_job(self, payload):
+        """Delete the upload staged for the bill"""
+        self.env['account.move']._docs2ai_staged_documents(payload.get('attachment')).unlink()
+
+    def _mark_done(self, record, extra):
+        self.sudo().write({
+            'state': 'done',
+            'res_id': record.id,
+            'result': json.dumps(extra),
+            'error': False,
+            'date_done': fields.Datetime.now(),
+        })
+
+    def _mark_failed(self, error):
+        _logger.info('Docs2AI: job %s failed: %s', self.id, error)
+        job_type = self.sudo().job_type
+        getattr(self, f'_discard_{job_type}_job')(json.loads(self.sudo().payload))
+        self.sudo().write({
+            'state': 'failed',
+            'error': str(error),
+            'date_done': fields.Datetime.now(),
+        })
+
+    def _retry_later(self, error):
+        """Leave the job pending for a new transaction, unless it ran JOB_MAX_ATTEMPTS times"""
+        if self.sudo().attempts >= JOB_MAX_ATTEMPTS:
+            self._mark_failed(error)
+            return
+        _logger.info('Docs2AI: job %s hit a transient error, will retry: %s', self.id, error)
+        self.sudo().write({'error': str(error)})
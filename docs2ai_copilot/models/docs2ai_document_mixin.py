@@ -0,0 +1,79 @@
+from odoo import models, api
+
+
+class Docs2AIDocumentMixin(models.AbstractModel):
+    """
+    Documents sent along with REST API creates (vendor bills, expenses):
+    attached to the new record and posted in its chatter.
+    """
+    _name = 'docs2ai.document.mixin'
+    _description = 'Docs2AI API document attachment'
+
+    @api.model
+    def _docs2ai_stage_document(self, attachment_data):
+        """
+        Store an upload ahead of the record it belongs to (asynchronous
+        requests): the attachment is created unlinked (res_id 0) and
+        `attachment_data` is replaced by its `attachment_id`.
+        """
+        if not attachment_data or not attachment_data.get('raw'):
+            return attachment_data
+        attachment = self.env['ir.attachment'].sudo().create({
+            'name': attachment_data['name'],
+            'raw': attachment_data['raw'],
+            'mimetype': attachment_data['mimetype'],
+            'res_model': self._name,
+            'res_id': 0,
+            'type': 'binary',
+        })
+        return {'attachment_id': attachment.id}
+
+    @api.model
+    def _docs2ai_staged_documents(self, attachment_data):
+        """Unlinked upload of the current user referenced by `attachment_data`"""
+        if not attachment_data or not attachment_data.get('attachment_id'):
+            return self.env['ir.attachment']
+        return self.env['ir.attachment'].sudo().search([
+            ('id', '=', attachment_data['attachment_id']),
+            ('res_model', '=', self._name),
+            ('res_id', '=', 0),
+            ('create_uid', '=', self.env.uid),
+        ])
+
+    def _docs2ai_attach_document(self, attachment_data, default_name, body, set_main=False):
+        """
+        Attach the document of an API create and post it in the chatter.
+        `attachment_data` holds either base64 `data`, `raw` bytes (multipart
+        upload), or the `attachment_id` of an upload of the same user stored
+        beforehand (asynchronous requests).
+        """
+        self.ensure_one()
+        if not attachment_data:
+            return None
+        Attachment = self.env['ir.attachment'].sudo()
+        if attachment_data.get('attachment_id'):
+            attachment = self._docs2ai_staged_documents(attachment_data)
+            if not attachment:
+                return None
+            attachment.write({'res_id': self.id})
+        elif attachment_data.get('raw') or attachment_data.get('data'):
+            vals = {
+                'name': attachment_data.get('name', default_name),
+                'res_model': self._name,
+                'res_id': self.id,
+                'mimetype': attachment_data.get('mimetype', 'application/pdf'),
+                'type': 'binary',
+            }
+            # Raw bytes go straight to the filestore, without a base64 copy
+            if attachment_data.get('raw'):
+                vals['raw'] = attachment_data['raw']
+            else:
+                vals['datas'] = attachment_data['data']
+            attachment = Attachment.create(vals)
+        else:
+            return None
+        if set_main:
+            # Set as main attachment
+            self._message_set_main_attachment_id(attachment, force=True)
+        self.message_post(body=body, attachment_ids=[attachment.id])
+        return attachment.id
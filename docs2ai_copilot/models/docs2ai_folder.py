@@ -0,0 +1,356 @@
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import psycopg2
+import requests
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+# Seconds a successful folder validation is trusted before it is re-checked
+DEFAULT_FOLDER_CACHE_TTL = 3600
+# Seconds the stored load of a pooled folder is served to status polls
+POOL_STATUS_TTL = 15
+# Folders of the pool polled in parallel
+POOL_STATUS_WORKERS = 8
+
+
+class Docs2AIFolder(models.Model):
+    _name = 'docs2ai.folder'
+    _description = 'Docs2AI folder metadata'
+    _order = 'folder_id'
+
+    api_key_hash = fields.Char(string='API Key Hash', required=True, readonly=True, index=True,
+                               default=lambda self: self._default_api_key_hash())
+    folder_id = fields.Char(string='Folder ID', required=True)
+    folder_name = fields.Char(string='Folder Name', readonly=True)
+    scanner_link = fields.Char(string='Scanner Link', readonly=True)
+    last_checked = fields.Datetime(string='Last Checked', readonly=True)
+
+    # Upload pool: documents are routed to the least-loaded pooled folder
+    use_for_uploads = fields.Boolean(string='In Upload Pool', default=False,
+                                     help='Route uploads to this folder, balanced with the other pooled folders')
+    company_id = fields.Many2one('res.company', string='Company',
+                                 help='Only use this folder for documents of this company (all companies if empty)')
+    upload_type = fields.Selection([
+        ('vendor_bill', 'Vendor Bill'),
+        ('expense', 'Expense'),
+    ], string='Upload Type', help='Only use this folder for this kind of document (all kinds if empty)')
+    total_pending = fields.Integer(string='Pending Documents', readonly=True,
+                                   help='Last known number of documents waiting in this Docs2AI folder')
+    is_running = fields.Boolean(string='Processing', readonly=True)
+    status_checked = fields.Datetime(string='Status Checked', readonly=True)
+
+    def init(self):
+        """One cache row per (api_key, folder_id)"""
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS docs2ai_folder_api_key_folder_uniq
+            ON docs2ai_folder (api_key_hash, folder_id)
+        """)
+
+    @api.model
+    def _hash_api_key(self, api_key):
+        """Hash the API key so the secret is not duplicated in this table"""
+        return hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()
+
+    @api.model
+    def _default_api_key_hash(self):
+        api_key = self.env['ir.config_parameter'].sudo().get_param('docs2ai.api_key') or ''
+        return self._hash_api_key(api_key.strip())
+
+    @api.model
+    def _get_cache_ttl(self):
+        """Cache lifetime in seconds (docs2ai.folder_cache_ttl)"""
+        ttl = self.env['ir.config_parameter'].sudo().get_param('docs2ai.folder_cache_ttl')
+        try:
+            return int(ttl) if ttl else DEFAULT_FOLDER_CACHE_TTL
+        except (ValueError, TypeError):
+            return DEFAULT_FOLDER_CACHE_TTL
+
+    def _is_fresh(self):
+        self.ensure_one()
+        if not self.last_checked:
+            return False
+        max_age = timedelta(seconds=self._get_cache_ttl())
+        return fields.Datetime.now() - self.last_checked < max_age
+
+    @api.model
+    def _fetch_folder_info(self, api_key, folder_id):
+        """Call get-scanner-link and return (folder_name, scanner_link), raising UserError when invalid"""
+        api_url = f'http://backend.test/api/enterprise/{folder_id}/get-scanner-link'
+        headers = {
+            'Authorization': f'Bearer {api_key}'
+        }
+
+        _logger.info(f'Validating folder_id {folder_id} with Docs2AI API...')
+        try:
+            response = requests.get(api_url, headers=headers, timeout=10)
+        except requests.exceptions.RequestException as e:
+            _logger.error(f'Request exception during folder validation: {str(e)}')
+            raise UserError(_('Error connecting to Docs2AI API: %s. Folder ID was not saved.') % str(e))
+
+        if response.status_code == 404:
+            try:
+                error_data = response.json() if response.content else {}
+            except ValueError:
+                error_data = {}
+            if not isinstance(error_data, dict):
+                error_data = {}
+            error_msg = error_data.get('message') or 'Folder not found'
+            _logger.error(f'Folder validation failed: {error_msg}')
+            raise UserError(_('Folder validation failed: %s. Folder ID was not saved.') % error_msg)
+
+        if response.status_code != 200:
+            error_msg = response.text or f'HTTP {response.status_code}'
+            _logger.error(f'Folder validation error: {error_msg}')
+            raise UserError(_('Error validating folder: %s. Folder ID was not saved.') % error_msg)
+
+        try:
+            response_data = response.json()
+        except ValueError as e:
+            _logger.error(f'Unexpected error during folder validation: {str(e)}')
+            raise UserError(_('An error occurred: %s. Folder ID was not saved.') % str(e))
+        _logger.info(f'API Response: {response_data}')
+        if not isinstance(response_data, dict):
+            raise UserError(_('Folder validation failed: %s. Folder ID was not saved.') % _('Invalid response'))
+
+        if response_data.get('status') != 'success':
+            error_msg = response_data.get('message', 'Unknown error')
+            raise UserError(_('Folder validation failed: %s. Folder ID was not saved.') % error_msg)
+
+        folder_name = response_data.get('folder_name', '')
+        scanner_link = response_data.get('scanner_link', '')
+        _logger.info(f'Folder validated successfully: {folder_name}, Scanner link: {scanner_link}')
+        return folder_name, scanner_link
+
+    @api.model
+    def _get_folder_info(self, api_key, folder_id, force_refresh=False):
+        """
+        Return the cache row for (api_key, folder_id), validating against
+        Docs2AI only when the row is missing or older than the TTL.
+        """
+        api_key_hash = self._hash_api_key(api_key)
+        folder = self.search([
+            ('api_key_hash', '=', api_key_hash),
+            ('folder_id', '=', folder_id),
+        ], limit=1)
+        if folder and not force_refresh and folder._is_fresh():
+            _logger.info(f'Folder {folder_id} served from cache: {folder.folder_name}')
+            return folder
+
+        folder_name, scanner_link = self._fetch_folder_info(api_key, folder_id)
+        vals = {
+            'folder_name': folder_name,
+            'scanner_link': scanner_link,
+            'last_checked': fields.Datetime.now(),
+        }
+        if folder:
+            folder.write(vals)
+        else:
+            vals.update({
+                'api_key_hash': api_key_hash,
+                'folder_id': folder_id,
+            })
+            folder = self.create(vals)
+        return folder
+
+    @api.model
+    def _cron_refresh_folders(self):
+        """Refresh cached folders in the background and heal docs2ai.folder_name / docs2ai.scanner_link"""
+        params = self.env['ir.config_parameter'].sudo()
+        api_key = (params.get_param('docs2ai.api_key') or '').strip()
+        folder_id = (params.get_param('docs2ai.folder_id') or '').strip()
+        if not api_key:
+            return
+
+        folder_ids = set(self.search([('api_key_hash', '=', self._hash_api_key(api_key))]).mapped('folder_id'))
+        if folder_id:
+            folder_ids.add(folder_id)
+
+        for cached_folder_id in sorted(folder_ids):
+            try:
+                refreshed = self._get_folder_info(api_key, cached_folder_id, force_refresh=True)
+            except UserError as e:
+                _logger.warning('Docs2AI: could not refresh folder %s: %s', cached_folder_id, e)
+                continue
+            if cached_folder_id != folder_id:
+                continue
+            if params.get_param('docs2ai.folder_name', '') != (refreshed.folder_name or ''):
+                params.set_param('docs2ai.folder_name', refreshed.folder_name or '')
+            if params.get_param('docs2ai.scanner_link', '') != (refreshed.scanner_link or ''):
+                _logger.info('Docs2AI: scanner link for folder %s updated', folder_id)
+                params.set_param('docs2ai.scanner_link', refreshed.scanner_link or '')
+
+    def action_refresh(self):
+        """Re-validate the selected folders against Docs2AI"""
+        api_key = (self.env['ir.config_parameter'].sudo().get_param('docs2ai.api_key') or '').strip()
+        if not api_key:
+            raise UserError(_('Docs2AI API Key is not configured. Please configure it in Settings → Docs2AI.'))
+        for folder in self:
+            self._get_folder_info(api_key, folder.folder_id, force_refresh=True)
+        return True
+
+    # ------------------------------------------------------------------
+    # Upload pool
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _get_upload_pool(self, company=None, upload_type=None):
+        """Pooled folders usable for documents of `company` and `upload_type`"""
+        domain = [
+            ('use_for_uploads', '=', True),
+            ('api_key_hash', '=', self._default_api_key_hash()),
+        ]
+        if company:
+            domain.append(('company_id', 'in', [company.id, False]))
+        if upload_type:
+            domain.append(('upload_type', 'in', [upload_type, False]))
+        return self.search(domain)
+
+    @api.model
+    def _get_pool_folder_ids(self, company=None, upload_type=None):
+        """Folder IDs of the pool, falling back to the single docs2ai.folder_id setting"""
+        pool = self._get_upload_pool(company, upload_type)
+        if pool:
+            return pool.mapped('folder_id')
+        folder_id = (self.env['ir.config_parameter'].sudo().get_param('docs2ai.folder_id') or '').strip()
+        return [folder_id] if folder_id else []
+
+    @api.model
+    def _pick_upload_folder(self, company=None, upload_type=None, charged=None):
+        """
+        Return the folder ID of the least-loaded pooled folder, based on the
+        last known total_pending. `charged` ({folder record id: documents})
+        counts the documents already routed by the caller's batch: the chosen
+        folder is charged one more so consecutive uploads spread over the
+        pool. Nothing is written, so concurrent uploads never contend on
+        the pool rows.
+        """
+        pool = self._get_upload_pool(company, upload_type)
+        if not pool:
+            return (self.env['ir.config_parameter'].sudo().get_param('docs2ai.folder_id') or '').strip()
+
+        charged = charged if charged is not None else {}
+        folder = min(pool, key=lambda f: (
+            f.total_pending + charged.get(f.id, 0),
+            f.status_checked or fields.Datetime.now(),
+            f.id,
+        ))
+        charged[folder.id] = charged.get(folder.id, 0) + 1
+        return folder.folder_id
+
+    @api.model
+    def _fetch_progress_status(self, api_key, folder_id):
+        """Call get-progress-status for one folder and return (total_pending, is_running, message)"""
+        base_url = f'http://backend.test/api/enterprise/{folder_id}/get-progress-status'
+        headers = {
+            'Authorization': api_key,
+            'Accept': 'application/json',
+        }
+
+        _logger.info('Docs2AI: Requesting status for folder %s at %s', folder_id, base_url)
+        response_json = {}
+        response = requests.get(base_url, headers=headers, timeout=10)
+        _logger.info('Docs2AI: Response status code: %s', response.status_code)
+        response.raise_for_status()
+        try:
+            if response.content:
+                response_json = response.json()
+                _logger.info('Docs2AI: Status response: %s', response_json)
+        except (ValueError, requests.exceptions.JSONDecodeError):
+            _logger.warning('Docs2AI get-progress-status response is not JSON.')
+            response_json = {}
+
+        data = response_json.get('data') if isinstance(response_json, dict) else {}
+        total_pending = 0
+        is_running = False
+
+        if isinstance(data, dict):
+            total_pending = int(data.get('total_pending') or 0)
+            is_running = bool(data.get('is_running'))
+        elif isinstance(data, list):
+            total_pending = len(data)
+            is_running = any(
+                isinstance(item, dict) and item.get('status') in {'pending', 'in_progress'}
+                for item in data
+            )
+
+        message = response_json.get('message') if isinstance(response_json, dict) else ''
+        return total_pending, is_running, message
+
+    @api.model
+    def _get_pool_status(self, api_key, company=None):
+        """
+        Aggregate the status of every folder of the company pool.
+
+        Rows checked less than POOL_STATUS_TTL seconds ago are served as is;
+        the other folders are polled concurrently and their load is stored
+        from a separate cursor (see _store_pool_status), so the request
+        itself stays read-only.
+        """
+        pool = self._get_upload_pool(company)
+        folder_ids = pool.mapped('folder_id') or self._get_pool_folder_ids(company)
+
+        limit_date = fields.Datetime.now() - timedelta(seconds=POOL_STATUS_TTL)
+        results = {
+            folder.folder_id: (folder.total_pending, folder.is_running, '')
+            for folder in pool
+            if folder.status_checked and folder.status_checked > limit_date
+        }
+        stale_ids = [folder_id for folder_id in folder_ids if folder_id not in results]
+
+        errors = []
+        if stale_ids:
+            with ThreadPoolExecutor(max_workers=min(len(stale_ids), POOL_STATUS_WORKERS)) as executor:
+                futures = {
+                    folder_id: executor.submit(self._fetch_progress_status, api_key, folder_id)
+                    for folder_id in stale_ids
+                }
+            fetched = {}
+            for folder_id, future in futures.items():
+                try:
+                    fetched[folder_id] = future.result()
+                except requests.RequestException as exc:
+                    _logger.warning('Failed to fetch Docs2AI verification status for folder %s: %s', folder_id, exc)
+                    errors.append(str(exc))
+            results.update(fetched)
+            self._store_pool_status(pool.filtered(lambda f: f.folder_id in fetched), fetched, limit_date)
+
+        messages = [message for _pending, _running, message in results.values() if message]
+        return {
+            'success': len(errors) < len(folder_ids),
+            'message': '; '.join(errors if len(errors) == len(folder_ids) else messages),
+            'total_pending': sum(pending for pending, _running, _message in results.values()),
+            'is_running': any(running for _pending, running, _message in results.values()),
+        }
+
+    @api.model
+    def _store_pool_status(self, folders, fetched, limit_date):
+        """
+        Store the polled load of `folders` in its own short transaction.
+        Rows another poll is updating, or refreshed since `limit_date`, are
+        left alone: the value is only a routing hint.
+        """
+        if not folders:
+            return
+        try:
+            with self.env.registry.cursor() as cr:
+                cr.execute("""
+                    SELECT id, folder_id FROM docs2ai_folder
+                    WHERE id IN %s AND (status_checked IS NULL OR status_checked <= %s)
+                    FOR UPDATE SKIP LOCKED
+                """, [tuple(folders.ids), limit_date])
+                now = fields.Datetime.now()
+                for folder_id, folder_folder_id in cr.fetchall():
+                    pending, running, _message = fetched[folder_folder_id]
+                    cr.execute("""
+                        UPDATE docs2ai_folder
+                        SET total_pending = %s, is_running = %s, status_checked = %s
+                        WHERE id = %s
+                    """, [pending, running, now, folder_id])
+        except psycopg2.OperationalError as exc:
+            _logger.info('Docs2AI: pool status not stored, concurrent update: %s', exc)
@@ -0,0 +1,104 @@
+import logging
+from datetime import timedelta
+
+import psycopg2
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Hours a stored response is replayed for retries with the same key
+DEFAULT_IDEMPOTENCY_KEY_TTL_HOURS = 24
+
+
+class Docs2AIIdempotencyKey(models.Model):
+    _name = 'docs2ai.idempotency.key'
+    _description = 'Docs2AI API idempotency key'
+    _order = 'id desc'
+
+    key = fields.Char(string='Key', required=True, readonly=True)
+    user_id = fields.Many2one('res.users', string='User', required=True, readonly=True, ondelete='cascade')
+    request_hash = fields.Char(string='Request Hash', required=True, readonly=True)
+    response_status = fields.Integer(string='Response Status', readonly=True)
+    response_body = fields.Text(string='Response Body', readonly=True)
+
+    def init(self):
+        """Keys are unique per user; the purge scans by creation date"""
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS docs2ai_idempotency_key_user_key_uniq
+            ON docs2ai_idempotency_key (user_id, key)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS docs2ai_idempotency_key_create_date_idx
+            ON docs2ai_idempotency_key (create_date)
+        """)
+
+    @api.model
+    def _fetch(self, cr, key):
+        cr.execute("""
+            SELECT request_hash, response_status, response_body
+            FROM docs2ai_idempotency_key
+            WHERE user_id = %s AND key = %s
+        """, [self.env.uid, key])
+        return cr.fetchone()
+
+    @api.model
+    def _claim(self, key, request_hash):
+        """
+        Reserve `key` for the current user. Returns (id, None) when the
+        request must run, else (None, (request_hash, response_status,
+        response_body)) of the earlier request, or (None, None) if it
+        vanished meanwhile.
+
+        A request holding the key makes concurrent ones wait on the unique
+        index until it commits (their insert then fails to serialize, and
+        the stored response is read from a fresh transaction) or rolls back
+        (their insert then succeeds).
+        """
+        cr = self.env.cr
+        try:
+            with cr.savepoint(flush=False):
+                cr.execute("""
+                    INSERT INTO docs2ai_idempotency_key
+                        (key, user_id, request_hash, create_uid, write_uid, create_date, write_date)
+                    VALUES (%(key)s, %(uid)s, %(hash)s, %(uid)s, %(uid)s,
+                            now() at time zone 'UTC', now() at time zone 'UTC')
+                    ON CONFLICT (user_id, key) DO NOTHING
+                    RETURNING id
+                """, {'key': key, 'uid': self.env.uid, 'hash': request_hash})
+                row = cr.fetchone()
+        except psycopg2.errors.SerializationFailure:
+            with self.env.registry.cursor() as fresh_cr:
+                return None, self._fetch(fresh_cr, key)
+        if row:
+            return row[0], None
+        return None, self._fetch(cr, key)
+
+    @api.model
+    def _record_response(self, claim_id, status, body):
+        """Store a 2xx response for replay; otherwise free the key so the request can be retried"""
+        cr = self.env.cr
+        try:
+            if 200 <= status < 300:
+                cr.execute("""
+                    UPDATE docs2ai_idempotency_key
+                    SET response_status = %s, response_body = %s, write_date = now() at time zone 'UTC'
+                    WHERE id = %s
+                """, [status, body, claim_id])
+            else:
+                cr.execute('DELETE FROM docs2ai_idempotency_key WHERE id = %s', [claim_id])
+        except psycopg2.errors.InFailedSqlTransaction:
+            # The request failed its transaction, the key is rolled back with it
+            pass
+
+    @api.model
+    def _cron_purge_idempotency_keys(self):
+        """Drop keys older than docs2ai.idempotency_key_ttl_hours"""
+        hours = self.env['ir.config_parameter'].sudo().get_param('docs2ai.idempotency_key_ttl_hours')
+        try:
+            hours = int(hours) if hours else DEFAULT_IDEMPOTENCY_KEY_TTL_HOURS
+        except (ValueError, TypeError):
+            hours = DEFAULT_IDEMPOTENCY_KEY_TTL_HOURS
+        limit_date = fields.Datetime.now() - timedelta(hours=hours)
+        self.env.cr.execute('DELETE FROM docs2ai_idempotency_key WHERE create_date < %s', [limit_date])
+        _logger.info('Docs2AI: purged %s idempotency keys older than %s hours', self.env.cr.rowcount, hours)
@@ -0,0 +1,71 @@
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Days a deletion stays queryable through /api/deletions
+DEFAULT_TOMBSTONE_RETENTION_DAYS = 90
+
+
+class Docs2AITombstone(models.Model):
+    _name = 'docs2ai.tombstone'
+    _description = 'Docs2AI deleted record'
+    _order = 'id desc'
+
+    res_model = fields.Char(string='Model', required=True, readonly=True)
+    res_id = fields.Integer(string='Record ID', required=True, readonly=True)
+    deleted_at = fields.Datetime(string='Deleted On', required=True, readonly=True, default=fields.Datetime.now)
+
+    def init(self):
+        """Deletions are always queried per model and since a date"""
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS docs2ai_tombstone_model_deleted_at_idx
+            ON docs2ai_tombstone (res_model, deleted_at)
+        """)
+
+    @api.model
+    def _record_unlink(self, records):
+        """Log the deletion of `records` (one batched insert)"""
+        if not records:
+            return
+        self.sudo().create([
+            {'res_model': records._name, 'res_id': record_id}
+            for record_id in records.ids
+        ])
+
+    @api.model
+    def _cron_purge_tombstones(self):
+        """Drop deletions older than docs2ai.tombstone_retention_days"""
+        days = self.env['ir.config_parameter'].sudo().get_param('docs2ai.tombstone_retention_days')
+        try:
+            days = int(days) if days else DEFAULT_TOMBSTONE_RETENTION_DAYS
+        except (ValueError, TypeError):
+            days = DEFAULT_TOMBSTONE_RETENTION_DAYS
+        limit_date = fields.Datetime.now() - timedelta(days=days)
+        self.env.cr.execute('DELETE FROM docs2ai_tombstone WHERE deleted_at < %s', [limit_date])
+        _logger.info('Docs2AI: purged %s tombstones older than %s days', self.env.cr.rowcount, days)
+
+
+class Docs2AISyncMixin(models.AbstractModel):
+    """
+    Support for models exposed by the REST API: an index on write_date for
+    updated_since filters, and a tombstone for every unlink.
+    """
+    _name = 'docs2ai.sync.mixin'
+    _description = 'Docs2AI change-feed support'
+
+    def init(self):
+        super().init()
+        if self._abstract:
+            return
+        self.env.cr.execute(f"""
+            CREATE INDEX IF NOT EXISTS {self._table}_docs2ai_write_date_idx
+            ON "{self._table}" (write_date)
+        """)
+
+    def unlink(self):
+        if not self.env.context.get('docs2ai_tombstone_logged'):
+            self.env['docs2ai.tombstone']._record_unlink(self)
+        return super().unlink()
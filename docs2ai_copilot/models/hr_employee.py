@@ -0,0 +1,24 @@
+from odoo import models, api
+
+# Fields deciding which employee belongs to a user in a company
+EMPLOYEE_USER_FIELDS = {'user_id', 'company_id', 'active'}
+
+
+class HrEmployee(models.Model):
+    _inherit = 'hr.employee'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        if any(vals.get('user_id') for vals in vals_list):
+            self.env['docs2ai.api.cache']._clear_lookup_caches('employee')
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if EMPLOYEE_USER_FIELDS & set(vals):
+            self.env['docs2ai.api.cache']._clear_lookup_caches('employee')
+        return super().write(vals)
+
+    def unlink(self):
+        if self.mapped('user_id'):
+            self.env['docs2ai.api.cache']._clear_lookup_caches('employee')
+        return super().unlink()
@@ -7,23 +7,33 @@ _logger = logging.getLogger(__name__)
 
 
 class HrExpense(models.Model):
-    _inherit = 'hr.expense'
+    _name = 'hr.expense'
+    _inherit = ['hr.expense', 'docs2ai.sync.mixin', 'docs2ai.document.mixin']
 
-    docs2ai_copiloted = fields.Boolean(string='Uploaded to Docs2AI', compute='_compute_docs2ai_copiloted', readonly=True, store=False)
-    docs2ai_copilot_date = fields.Datetime(string='Docs2AI Upload Date', compute='_compute_docs2ai_copiloted', readonly=True, store=False)
+    docs2ai_copiloted = fields.Boolean(string='Uploaded to Docs2AI', related='account_move_id.docs2ai_copiloted', store=True, readonly=True)
+    docs2ai_copilot_date = fields.Datetime(string='Docs2AI Upload Date', related='account_move_id.docs2ai_copilot_date', store=True, readonly=True)
     docs2ai_has_scanner_link = fields.Boolean(string='Has Scanner Link', compute='_compute_docs2ai_scanner_link', readonly=True, store=False)
     
-    @api.depends('account_move_id')
-    def _compute_docs2ai_copiloted(self):
-        """Check if the associated account move has been uploaded to Docs2AI"""
-        for record in self:
-            if record.account_move_id:
-                record.docs2ai_copiloted = record.account_move_id.docs2ai_copiloted
-                record.docs2ai_copilot_date = record.account_move_id.docs2ai_copilot_date
-            else:
-                record.docs2ai_copiloted = False
-                record.docs2ai_copilot_date = False
-    
+    def init(self):
+        """
+        Partial index so "not yet sent" filters only touch pending expenses, and
+        composite indexes for the filters and orders of the API list route
+        """
+        super().init()
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS hr_expense_docs2ai_not_copiloted_idx
+            ON hr_expense (id)
+            WHERE docs2ai_copiloted IS NULL OR NOT docs2ai_copiloted
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS hr_expense_docs2ai_date_idx
+            ON hr_expense (date, id)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS hr_expense_docs2ai_employee_date_idx
+            ON hr_expense (employee_id, date)
+        """)
+
     @api.depends()
     def _compute_docs2ai_scanner_link(self):
         """Check if scanner link is configured"""
@@ -0,0 +1,57 @@
+from odoo import models, api
+
+
+class ProductProduct(models.Model):
+    _name = 'product.product'
+    _inherit = ['product.product', 'docs2ai.sync.mixin']
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        products = super().create(vals_list)
+        if any(products.mapped('can_be_expensed')):
+            self.env['docs2ai.api.cache']._invalidate()
+        return products
+
+    def write(self, vals):
+        # Only expense categories are cached by the API
+        if 'can_be_expensed' in vals or any(self.mapped('can_be_expensed')):
+            self.env['docs2ai.api.cache']._invalidate()
+        return super().write(vals)
+
+    def unlink(self):
+        if any(self.mapped('can_be_expensed')):
+            self.env['docs2ai.api.cache']._invalidate()
+        return super().unlink()
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    def init(self):
+        """Expense categories are also filtered on their template's write_date"""
+        super().init()
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS product_template_docs2ai_write_date_idx
+            ON product_template (write_date)
+        """)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        templates = super().create(vals_list)
+        if any(templates.mapped('can_be_expensed')):
+            self.env['docs2ai.api.cache']._invalidate()
+        return templates
+
+    def write(self, vals):
+        if 'can_be_expensed' in vals or any(self.mapped('can_be_expensed')):
+            self.env['docs2ai.api.cache']._invalidate()
+        return super().write(vals)
+
+    def unlink(self):
+        if any(self.mapped('can_be_expensed')):
+            self.env['docs2ai.api.cache']._invalidate()
+        # Variants may go away with their template through ON DELETE CASCADE,
+        # which bypasses product.product.unlink(): log them here, once
+        variants = self.with_context(active_test=False).product_variant_ids
+        self.env['docs2ai.tombstone']._record_unlink(variants)
+        return super(ProductTemplate, self.with_context(docs2ai_tombstone_logged=True)).unlink()
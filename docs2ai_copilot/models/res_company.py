@@ -0,0 +1,46 @@
+from odoo import models, api, tools
+
+
+class ResCompany(models.Model):
+    _inherit = 'res.company'
+
+    def write(self, vals):
+        if 'account_purchase_tax_id' in vals:
+            self.env['docs2ai.api.cache']._clear_lookup_caches('defaults')
+        return super().write(vals)
+
+    @api.model
+    @tools.ormcache('company_id', "self.env['docs2ai.api.cache']._lookup_generation('defaults')")
+    def _docs2ai_api_defaults(self, company_id):
+        """
+        Defaults of the API create paths for a company: first expense and
+        income accounts, account of auto-created purchase taxes and the
+        Units UoM. Cached until accounts, UoMs or the company's default
+        purchase tax change.
+        """
+        company = self.sudo().browse(company_id)
+        Account = self.env['account.account'].sudo()
+        # company_id up to Odoo 17, company_ids since
+        company_field = 'company_ids' if 'company_ids' in Account._fields else 'company_id'
+        expense_account = Account.search([('account_type', '=', 'expense'), (company_field, 'in', [company_id])], limit=1)
+        income_account = Account.search([('account_type', '=', 'income'), (company_field, 'in', [company_id])], limit=1)
+
+        # Account of the tax line of the default purchase tax, else the expense account
+        purchase_tax_account = expense_account
+        tax_line = company.account_purchase_tax_id.invoice_repartition_line_ids.filtered(
+            lambda l: l.repartition_type == 'tax'
+        )
+        if tax_line and tax_line[0].account_id:
+            purchase_tax_account = tax_line[0].account_id
+
+        Uom = self.env['uom.uom'].sudo()
+        uom_unit = self.env.ref('uom.product_uom_unit', raise_if_not_found=False)
+        if not uom_unit:
+            uom_unit = Uom.search([('name', '=', 'Units')], limit=1) or Uom.search([], limit=1)
+
+        return {
+            'expense_account_id': expense_account.id or False,
+            'income_account_id': income_account.id or False,
+            'purchase_tax_account_id': purchase_tax_account.id or False,
+            'uom_unit_id': uom_unit.id or False,
+        }
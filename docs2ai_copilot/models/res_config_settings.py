@@ -1,4 +1,3 @@
-import requests
 import logging
 
 from odoo import models, fields, api, _
@@ -52,63 +51,18 @@ class ResConfigSettings(models.TransientModel):
         
         # Only validate if folder_id changed and is provided
         if new_folder_id and new_folder_id != current_folder_id and api_key:
+            # Known folders are served from the docs2ai.folder cache without a network call;
+            # unknown or expired ones are validated against Docs2AI BEFORE saving
             try:
-                # Call API to validate folder_id BEFORE saving
-                api_url = f'http://backend.test/api/enterprise/{new_folder_id}/get-scanner-link'
-                headers = {
-                    'Authorization': f'Bearer {api_key}'
-                }
-                
-                _logger.info(f'Validating folder_id {new_folder_id} with Docs2AI API...')
-                response = requests.get(api_url, headers=headers, timeout=10)
-                
-                if response.status_code == 404:
-                    # Folder not found - don't save folder_id
-                    error_data = response.json() if response.content else {}
-                    error_msg = error_data.get('message', 'Folder not found')
-                    _logger.error(f'Folder validation failed: {error_msg}')
-                    # Revert folder_id to current value
-                    self.docs2ai_folder_id = current_folder_id
-                    raise UserError(_('Folder validation failed: %s. Folder ID was not saved.') % error_msg)
-                
-                elif response.status_code == 200:
-                    # Success - parse response and prepare to save
-                    response_data = response.json()
-                    _logger.info(f'API Response: {response_data}')
-                    
-                    if response_data.get('status') == 'success':
-                        folder_name = response_data.get('folder_name', '')
-                        scanner_link = response_data.get('scanner_link', '')
-                        
-                        # Log the scanner link format
-                        _logger.info(f'Scanner link received: {scanner_link}')
-                        
-                        # Update fields so they get saved
-                        self.docs2ai_folder_name = folder_name
-                        self.docs2ai_scanner_link = scanner_link
-                        
-                        _logger.info(f'Folder validated successfully: {folder_name}, Scanner link saved')
-                    else:
-                        error_msg = response_data.get('message', 'Unknown error')
-                        self.docs2ai_folder_id = current_folder_id
-                        raise UserError(_('Folder validation failed: %s. Folder ID was not saved.') % error_msg)
-                else:
-                    # Other error
-                    error_msg = response.text or f'HTTP {response.status_code}'
-                    _logger.error(f'Folder validation error: {error_msg}')
-                    self.docs2ai_folder_id = current_folder_id
-                    raise UserError(_('Error validating folder: %s. Folder ID was not saved.') % error_msg)
-                    
-            except requests.exceptions.RequestException as e:
-                _logger.error(f'Request exception during folder validation: {str(e)}')
+                folder = self.env['docs2ai.folder'].sudo()._get_folder_info(api_key, new_folder_id)
+            except UserError:
+                # Revert folder_id to current value
                 self.docs2ai_folder_id = current_folder_id
-                raise UserError(_('Error connecting to Docs2AI API: %s. Folder ID was not saved.') % str(e))
-            except Exception as e:
-                _logger.error(f'Unexpected error during folder validation: {str(e)}')
-                if isinstance(e, UserError):
-                    raise
-                self.docs2ai_folder_id = current_folder_id
-                raise UserError(_('An error occurred: %s. Folder ID was not saved.') % str(e))
+                raise
+            
+            # Update fields so they get saved
+            self.docs2ai_folder_name = folder.folder_name
+            self.docs2ai_scanner_link = folder.scanner_link
         elif not new_folder_id:
             # Folder ID cleared - clear folder info
             self.docs2ai_folder_name = ''
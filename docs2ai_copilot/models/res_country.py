@@ -0,0 +1,82 @@
+from odoo import models, api, tools
+
+
+class ResCountry(models.Model):
+    _inherit = 'res.country'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['docs2ai.api.cache']._clear_lookup_caches('country')
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['docs2ai.api.cache']._clear_lookup_caches('country')
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['docs2ai.api.cache']._clear_lookup_caches('country')
+        return super().unlink()
+
+    @api.model
+    @tools.ormcache('self.env.lang', "self.env['docs2ai.api.cache']._lookup_generation('country')")
+    def _docs2ai_country_lookup(self):
+        """
+        {lower-cased code or name: id}, names in the current language and in
+        English. Codes take precedence over names. Cached until countries
+        change.
+        """
+        keys = {}
+        rows = self.sudo().search_read([], ['code', 'name'], order='id')
+        for row in rows:
+            if row['code']:
+                keys.setdefault(row['code'].lower(), row['id'])
+        for lang in dict.fromkeys([self.env.lang, 'en_US']):
+            if lang != self.env.lang:
+                rows = self.sudo().with_context(lang=lang).search_read([], ['name'], order='id')
+            for row in rows:
+                keys.setdefault(row['name'].lower(), row['id'])
+        return keys
+
+    @api.model
+    def _docs2ai_resolve_country(self, value):
+        """Id of the country with code or name `value`, or None"""
+        return self._docs2ai_country_lookup().get(str(value).strip().lower())
+
+
+class ResCountryState(models.Model):
+    _inherit = 'res.country.state'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['docs2ai.api.cache']._clear_lookup_caches('state')
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['docs2ai.api.cache']._clear_lookup_caches('state')
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['docs2ai.api.cache']._clear_lookup_caches('state')
+        return super().unlink()
+
+    @api.model
+    @tools.ormcache("self.env['docs2ai.api.cache']._lookup_generation('state')")
+    def _docs2ai_state_lookup(self):
+        """
+        {(country id, lower-cased name or code): id}; names take precedence
+        over codes. Cached until states change.
+        """
+        self.env.cr.execute('SELECT id, country_id, name, code FROM res_country_state ORDER BY id')
+        rows = self.env.cr.fetchall()
+        keys = {}
+        for state_id, country_id, name, _code in rows:
+            keys.setdefault((country_id, name.lower()), state_id)
+        for state_id, country_id, _name, code in rows:
+            if code:
+                keys.setdefault((country_id, code.lower()), state_id)
+        return keys
+
+    @api.model
+    def _docs2ai_resolve_state(self, country_id, value):
+        """Id of the state of `country_id` with name or code `value`, or None"""
+        return self._docs2ai_state_lookup().get((country_id, str(value).strip().lower()))
@@ -0,0 +1,53 @@
+from odoo import models, api, tools
+
+
+class ResCurrency(models.Model):
+    _inherit = 'res.currency'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['docs2ai.api.cache']._invalidate()
+        self.env['docs2ai.api.cache']._clear_lookup_caches('currency')
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['docs2ai.api.cache']._invalidate()
+        self.env['docs2ai.api.cache']._clear_lookup_caches('currency')
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['docs2ai.api.cache']._invalidate()
+        self.env['docs2ai.api.cache']._clear_lookup_caches('currency')
+        return super().unlink()
+
+    @api.model
+    @tools.ormcache("self.env['docs2ai.api.cache']._lookup_generation('currency')")
+    def _docs2ai_currency_lookup(self):
+        """
+        ({upper-cased code or symbol: id}, {id: active}) of all currencies,
+        active or not. Codes take precedence over symbols, and active
+        currencies over inactive ones. Cached until currencies change.
+        """
+        self.env.cr.execute('SELECT id, name, symbol, active FROM res_currency ORDER BY active DESC, id')
+        rows = self.env.cr.fetchall()
+        keys = {}
+        for currency_id, name, _symbol, _active in rows:
+            keys.setdefault(name.upper(), currency_id)
+        for currency_id, _name, symbol, _active in rows:
+            if symbol:
+                keys.setdefault(symbol.upper(), currency_id)
+        return keys, {currency_id: active for currency_id, _name, _symbol, active in rows}
+
+    @api.model
+    def _docs2ai_resolve_currency(self, value, active_test=True):
+        """Id of the currency with code, symbol or id `value`, or None"""
+        keys, active = self._docs2ai_currency_lookup()
+        currency_id = keys.get(str(value).strip().upper())
+        if currency_id is None:
+            try:
+                currency_id = int(value)
+            except (ValueError, TypeError):
+                return None
+        if currency_id not in active or (active_test and not active[currency_id]):
+            return None
+        return currency_id
@@ -0,0 +1,270 @@
+import copy
+import json
+import logging
+import zlib
+
+import psycopg2
+
+from odoo import models, api, tools, _
+
+_logger = logging.getLogger(__name__)
+
+# Columns matched by the API partner search
+PARTNER_SEARCH_COLUMNS = ('name', 'vat', 'email', 'ref')
+# Natural keys of the API partner upsert, in match priority order
+PARTNER_UPSERT_KEYS = ('vat', 'ref', 'email_normalized')
+# Advisory lock buckets the upsert keys are hashed into (bounds the locks held)
+PARTNER_UPSERT_LOCK_BUCKETS = 1024
+
+
+class ResPartner(models.Model):
+    _name = 'res.partner'
+    _inherit = ['res.partner', 'docs2ai.sync.mixin']
+
+    def init(self):
+        """
+        Btree indexes for the API natural key lookups, and trigram GIN indexes
+        for the API partner search (btree indexes on the exact/prefix lookups
+        when pg_trgm cannot be installed).
+        """
+        super().init()
+        cr = self.env.cr
+        # Natural keys of the API lookups and upserts
+        for column in ('vat', 'ref', 'email_normalized'):
+            cr.execute(f"""
+                CREATE INDEX IF NOT EXISTS res_partner_docs2ai_{column}_idx
+                ON res_partner ({column})
+            """)
+        if not self._docs2ai_ensure_trigram():
+            cr.execute("""
+                CREATE INDEX IF NOT EXISTS res_partner_docs2ai_name_prefix_idx
+                ON res_partner (lower(name) text_pattern_ops)
+            """)
+            for column in ('vat', 'email', 'ref'):
+                cr.execute(f"""
+                    CREATE INDEX IF NOT EXISTS res_partner_docs2ai_{column}_lower_idx
+                    ON res_partner (lower({column}))
+                """)
+            return
+        for column in PARTNER_SEARCH_COLUMNS:
+            cr.execute(f"""
+                CREATE INDEX IF NOT EXISTS res_partner_docs2ai_{column}_trgm_idx
+                ON res_partner USING gin ({column} gin_trgm_ops)
+            """)
+
+    def _docs2ai_ensure_trigram(self):
+        """Install pg_trgm if possible (needs sufficient database rights)"""
+        cr = self.env.cr
+        cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cr.fetchone():
+            return True
+        try:
+            with cr.savepoint():
+                cr.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            return True
+        except psycopg2.Error as e:
+            _logger.warning('Docs2AI: pg_trgm unavailable, partner search falls back to exact/prefix matches: %s', e)
+            return False
+
+    @api.model
+    @tools.ormcache()
+    def _docs2ai_has_trigram(self):
+        self.env.cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return bool(self.env.cr.fetchone())
+
+    @api.model
+    def _docs2ai_search(self, query, limit=10, partner_type=None):
+        """
+        Ranked partner matches for `query` on name, VAT, email and ref, as a
+        list of (partner_id, score) with score in [0, 1]. One indexed query:
+        trigram similarity with pg_trgm, exact/prefix matches without it.
+        """
+        query = (query or '').strip()
+        if not query:
+            return []
+        where = ['active']
+        if partner_type == 'vendor':
+            where.append('supplier_rank > 0')
+        elif partner_type == 'customer':
+            where.append('customer_rank > 0')
+
+        params = {'query': query, 'limit': limit}
+        if self._docs2ai_has_trigram():
+            score = 'GREATEST({})'.format(', '.join(
+                f"similarity(COALESCE({column}, ''), %(query)s)" for column in PARTNER_SEARCH_COLUMNS
+            ))
+            match = ' OR '.join(f'{column} %% %(query)s' for column in PARTNER_SEARCH_COLUMNS)
+        else:
+            params['prefix'] = query.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            params['lower'] = query.lower()
+            score = """CASE
+                WHEN lower(name) = %(lower)s OR lower(vat) = %(lower)s
+                     OR lower(email) = %(lower)s OR lower(ref) = %(lower)s THEN 1.0
+                ELSE 0.5 END"""
+            match = """lower(name) LIKE %(prefix)s OR lower(vat) = %(lower)s
+                OR lower(email) = %(lower)s OR lower(ref) = %(lower)s"""
+        self.env.cr.execute(f"""
+            SELECT id, {score} AS score
+            FROM res_partner
+            WHERE {' AND '.join(where)} AND ({match})
+            ORDER BY score DESC, id DESC
+            LIMIT %(limit)s
+        """, params)
+        return [(partner_id, round(float(score), 4)) for partner_id, score in self.env.cr.fetchall()]
+
+    @api.model
+    def _docs2ai_upsert_keys(self, vals):
+        """Natural keys (field, value) of partner `vals`, in match priority order"""
+        keys = []
+        if vals.get('vat'):
+            keys.append(('vat', str(vals['vat']).strip()))
+        if vals.get('ref'):
+            keys.append(('ref', str(vals['ref']).strip()))
+        email = vals.get('email') and tools.email_normalize(vals['email'])
+        if email:
+            keys.append(('email_normalized', email))
+        return keys
+
+    @api.model
+    def _docs2ai_upsert_lock(self, keys):
+        """
+        Serialize the upserts of the same natural keys: session advisory locks
+        on the hashed keys, taken in sorted order so upserts cannot deadlock,
+        then a commit so the next transaction's snapshot sees everything the
+        upserts we waited for committed. Call it inside a try whose finally
+        runs pg_advisory_unlock_all(): session locks outlive the transaction,
+        so a failure after the first lock would otherwise leak them on the
+        pooled connection.
+        """
+        buckets = sorted({
+            zlib.crc32(f'{field}:{value}'.encode()) % PARTNER_UPSERT_LOCK_BUCKETS
+            for field, value in keys
+        })
+        self.env.cr.execute("""
+            SELECT count(pg_advisory_lock(hashtext('docs2ai.partner.upsert'), bucket))
+            FROM unnest(%s::int[]) AS bucket
+        """, [buckets])
+        self.env.cr.commit()
+
+    @api.model
+    def _docs2ai_upsert(self, entries):
+        """
+        Create or update one partner per (index, vals, rank_field) of
+        `entries`, matched on VAT, ref or normalized email among active
+        top-level partners shared by all companies or owned by one of the
+        caller's companies. Returns {index: (status, partner id or error)}
+        with status 'created', 'updated' or 'error'.
+
+        Matching is one indexed query, creates are one batched create() and
+        updates are one write() per distinct set of changed values; a failing
+        batch is retried entry by entry in savepoints.
+        """
+        results = {}
+        keys = {index: self._docs2ai_upsert_keys(vals) for index, vals, _rank_field in entries}
+        values = {field: sorted({value for entry_keys in keys.values() for f, value in entry_keys if f == field})
+                  for field in PARTNER_UPSERT_KEYS}
+        matches = {}
+        fields_used = [field for field in PARTNER_UPSERT_KEYS if values[field]]
+        if fields_used:
+            self.env.cr.execute(f"""
+                SELECT id, {', '.join(PARTNER_UPSERT_KEYS)}
+                FROM res_partner
+                WHERE active AND parent_id IS NULL
+                  AND (company_id IS NULL OR company_id = ANY(%s))
+                  AND ({' OR '.join(f'{field} = ANY(%s)' for field in fields_used)})
+                ORDER BY id
+            """, [self.env.companies.ids] + [values[field] for field in fields_used])
+            for partner_id, *row in self.env.cr.fetchall():
+                for field, value in zip(PARTNER_UPSERT_KEYS, row):
+                    if value:
+                        matches.setdefault((field, value), partner_id)
+
+        # Plan: update the match, else create (once per key within the request)
+        creates, updates, followers, owners = [], [], [], {}
+        for index, vals, rank_field in entries:
+            partner_id = next((matches[key] for key in keys[index] if key in matches), None)
+            if partner_id:
+                updates.append((index, partner_id, vals, rank_field))
+                continue
+            owner = next((owners[key] for key in keys[index] if key in owners), None)
+            if owner is not None:
+                followers.append((index, owner, vals, rank_field))
+            elif not vals.get('name'):
+                results[index] = ('error', _('Name is required'))
+            else:
+                creates.append((index, vals))
+                for key in keys[index]:
+                    owners[key] = index
+
+        def create(batch):
+            partners = self.create([copy.deepcopy(vals) for _index, vals in batch])
+            return [(index, 'created', partner.id) for (index, _vals), partner in zip(batch, partners)]
+
+        self._docs2ai_run_batch(creates, create, results)
+
+        for index, owner, vals, rank_field in followers:
+            status, partner_id = results[owner]
+            if status == 'error':
+                results[index] = ('error', _('Not upserted: item %s with the same key failed') % owner)
+            else:
+                updates.append((index, partner_id, vals, rank_field))
+
+        # Current values, so only actual changes are written: re-sent
+        # unchanged partners (the common case) cost no write at all
+        fields_sent = {field for _index, _partner_id, vals, _rank_field in updates for field in vals}
+        current = {row['id']: row for row in self.browse({entry[1] for entry in updates}).read(
+            sorted(fields_sent | {'customer_rank', 'supplier_rank'}))}
+
+        def update(batch):
+            # Later entries for the same partner win, like sequential writes
+            merged = {}
+            for _index, partner_id, vals, rank_field in batch:
+                vals = dict(vals)
+                # Ranks are raised to 1, never lowered
+                if rank_field and current[partner_id][rank_field]:
+                    del vals[rank_field]
+                merged.setdefault(partner_id, {}).update(vals)
+            # One write() per distinct set of changes
+            groups = {}
+            for partner_id, vals in merged.items():
+                changes = {
+                    field: value for field, value in vals.items()
+                    if self._docs2ai_upsert_value(current[partner_id][field]) != (value or False)
+                }
+                if changes:
+                    key = json.dumps(changes, sort_keys=True, default=str)
+                    groups.setdefault(key, (changes, []))[1].append(partner_id)
+            for changes, partner_ids in groups.values():
+                self.browse(partner_ids).write(changes)
+            return [(index, 'updated', partner_id) for index, partner_id, _vals, _rank_field in batch]
+
+        self._docs2ai_run_batch(updates, update, results)
+        return results
+
+    @api.model
+    def _docs2ai_upsert_value(self, value):
+        """Value read() returned, comparable with write() vals (many2one as id, empty as False)"""
+        if isinstance(value, tuple):
+            return value[0]
+        return value or False
+
+    @api.model
+    def _docs2ai_run_batch(self, batch, run, results):
+        """`run(batch)` in one savepoint, else entry by entry; outcomes are stored in `results`"""
+        if not batch:
+            return
+        cr = self.env.cr
+        try:
+            with cr.savepoint():
+                done = run(batch)
+        except Exception as e:
+            _logger.info('Docs2AI: partner upsert batch of %s failed (%s), retrying one by one', len(batch), e)
+            done = []
+            for entry in batch:
+                try:
+                    with cr.savepoint():
+                        done += run([entry])
+                except Exception as e:
+                    results[entry[0]] = ('error', str(e))
+        for index, status, partner_id in done:
+            results[index] = (status, partner_id)
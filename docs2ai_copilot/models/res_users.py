@@ -0,0 +1,54 @@
+from odoo import models, api, tools
+
+EXPENSE_APPROVER_GROUP = 'hr_expense.group_hr_expense_team_approver'
+
+
+class ResUsers(models.Model):
+    _inherit = 'res.users'
+
+    @api.model
+    def _docs2ai_groups_field(self):
+        """Name of the user groups field (groups_id up to Odoo 18, group_ids since)"""
+        return 'group_ids' if 'group_ids' in self._fields else 'groups_id'
+
+    @api.model
+    @tools.ormcache(cache='groups')
+    def _docs2ai_approver_group_ids(self):
+        """
+        Ids of the expense approver group and of every group implying it, so
+        a single domain on the groups field finds all approvers. Cached until
+        groups change.
+        """
+        group = self.env.ref(EXPENSE_APPROVER_GROUP, raise_if_not_found=False)
+        if not group:
+            return ()
+        # Walk the stored implied_ids upwards to a fixpoint: the transitive
+        # fields (trans_implied_ids up to 18) are computed and not searchable
+        Groups = self.env['res.groups'].sudo().with_context(active_test=False)
+        group_ids = {group.id}
+        new_ids = {group.id}
+        while new_ids:
+            implying = Groups.search([('implied_ids', 'in', list(new_ids))])
+            new_ids = set(implying.ids) - group_ids
+            group_ids |= new_ids
+        return tuple(sorted(group_ids))
+
+    @api.model
+    @tools.ormcache(cache='groups')
+    def _docs2ai_approver_group_id(self):
+        """Id of the expense approver group, or None. Cached until groups change."""
+        group = self.env.ref(EXPENSE_APPROVER_GROUP, raise_if_not_found=False)
+        return group.id if group else None
+
+    @api.model
+    @tools.ormcache('self.env.uid', 'self.env.company.id', "self.env['docs2ai.api.cache']._lookup_generation('employee')")
+    def _docs2ai_employee_id(self):
+        """
+        Id of the current user's employee in the current company, or None.
+        Cached until an employee's user or company changes.
+        """
+        employee = self.env['hr.employee'].sudo().search([
+            ('user_id', '=', self.env.uid),
+            ('company_id', '=', self.env.company.id),
+        ], limit=1)
+        return employee.id or None
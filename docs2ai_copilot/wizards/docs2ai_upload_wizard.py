@@ -268,10 +268,10 @@ class Docs2AIUploadWizard(models.TransientModel):
             default=''
         )
         
-        folder_id = self.env['ir.config_parameter'].sudo().get_param(
-            'docs2ai.folder_id', 
-            default=''
-        )
+        # Documents are spread over the company's folder pool (or the single configured folder)
+        company = self.invoice_id.company_id or self.expense_id.company_id or self.env.company
+        folders = self.env['docs2ai.folder'].sudo()
+        has_folder = bool(folders._get_pool_folder_ids(company, upload_type))
         
         return_url = self.env['ir.config_parameter'].sudo().get_param(
             'docs2ai.return_url',
@@ -281,16 +281,19 @@ class Docs2AIUploadWizard(models.TransientModel):
         if not api_key:
             raise UserError(_('Docs2AI API Key is not configured. Please configure it in Settings → Docs2AI.'))
         
-        if not folder_id:
+        if not has_folder:
             raise UserError(_('Folder ID is not configured. Please configure it in Settings → Docs2AI.'))
         
         # Upload all files
         success_count = 0
         failed_count = 0
         errors = []
+        # Documents routed per pooled folder by this batch
+        charged = {}
         
         for file_info in files_to_upload:
             try:
+                folder_id = folders._pick_upload_folder(company, upload_type, charged)
                 success, error_msg = self._upload_single_file(
                     file_info['data'],
                     file_info['filename'],